@@ -0,0 +1,318 @@
+"""Modo por lotes: evalúa scripts de expresiones sobre los conjuntos sin menús ni input()
+
+Ejemplo de script (sentencias separadas por ';' o saltos de línea):
+
+    R3 = R ** 3; print tra(R, A2); S = R ∘ E
+    print (A ∪ B) ∩ C
+    X = {1, 2, (1,a)}
+
+Cada sentencia produce una línea JSON en la salida:
+    {"line": 1, "name": "R3", "size": 9}
+    {"line": 1, "expr": "tra(R, A2)", "value": true}
+"""
+
+import argparse
+import json
+import re
+import sys
+from functools import partial
+
+from core import (
+    default_sets, parse_elements, ParseError, union, intersection, difference, complement,
+    cartesian_product, is_function, is_binary_relation, is_reflexive, is_symmetric,
+    is_transitive, relation_composition, relation_power, transitive_closure,
+    reflexive_closure, symmetric_closure, equivalence_closure
+)
+from equivalence import is_equivalence, equivalence_classes
+from order import (
+    is_antisymmetric, is_partial_order, is_total_order, minimal_elements, maximal_elements,
+    topological_sort, transitive_reduction
+)
+from reachability import strongly_connected_components
+
+_TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<set>\{[^}]*\})
+      | (?P<number>\d+)
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+      | (?P<op>\*\*|[∪∩∘×\\|&\-\^@*=(),;])
+    )""", re.VERBOSE)
+
+# Operadores binarios por nivel de precedencia (de menor a mayor)
+_UNION_OPS = {'∪': union, '|': union, '\\': difference, '-': difference}
+_PRODUCT_OPS = {
+    '∩': intersection, '&': intersection,
+    '×': cartesian_product, '*': cartesian_product,
+    '∘': relation_composition, '@': relation_composition,
+}
+
+# Paréntesis y llamadas anidados admitidos en una sentencia (el analizador es recursivo)
+MAX_NESTING = 100
+
+class BatchError(Exception):
+    """Error de sintaxis o de evaluación en un script por lotes"""
+
+def _parallel_operations(workers):
+    """Versiones paralelas de fun, sim, tra y la composición (modo --workers N)"""
+    import parallel
+    functions = {
+        'fun': partial(parallel.parallel_is_function, workers=workers),
+        'sim': partial(parallel.parallel_is_symmetric, workers=workers),
+        'tra': partial(parallel.parallel_is_transitive, workers=workers),
+    }
+    compose = partial(parallel.parallel_relation_composition, workers=workers)
+    product_ops = {**_PRODUCT_OPS, '∘': compose, '@': compose}
+    return functions, product_ops
+
+def _functions(sets_dict):
+    """Funciones disponibles en los scripts"""
+    def comp(set1):
+        if 'U' not in sets_dict:
+            raise BatchError("comp necesita el conjunto universal 'U', que no existe")
+        return complement(sets_dict['U'], set1)
+
+    return {
+        'bin': is_binary_relation,
+        'fun': is_function,
+        'ref': is_reflexive,
+        'sim': is_symmetric,
+        'tra': is_transitive,
+        'comp': comp,
+        'pow': relation_power,
+        'tclosure': transitive_closure,
+        'rclosure': reflexive_closure,
+        'sclosure': symmetric_closure,
+        'eclosure': equivalence_closure,
+        'equiv': is_equivalence,
+        'classes': equivalence_classes,
+        'anti': is_antisymmetric,
+        'po': is_partial_order,
+        'to': is_total_order,
+        'minimal': minimal_elements,
+        'maximal': maximal_elements,
+        # Tupla para que la salida JSON conserve el orden
+        'topo': lambda relation, base_set: tuple(topological_sort(relation, base_set)),
+        'hasse': transitive_reduction,
+        'scc': strongly_connected_components,
+        'len': len,
+    }
+
+def tokenize(text):
+    """Divide el script en tokens (tipo, valor, posición)"""
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if not match or match.end() == pos:
+            raise BatchError(f"carácter inesperado {text[pos]!r} en la posición {pos}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        tokens.append((kind, value, match.start(kind)))
+        pos = match.end()
+    return tokens
+
+def split_statements(tokens):
+    """Agrupa los tokens en sentencias separadas por ';'"""
+    statement = []
+    for token in tokens:
+        if token[0] == 'op' and token[1] == ';':
+            if statement:
+                yield statement
+            statement = []
+        else:
+            statement.append(token)
+    if statement:
+        yield statement
+
+class _Evaluator:
+    """Analizador descendente recursivo que evalúa una sentencia a medida que la lee"""
+
+    def __init__(self, tokens, sets_dict, functions, product_ops=_PRODUCT_OPS):
+        self.tokens = tokens
+        self.pos = 0
+        self.sets_dict = sets_dict
+        self.functions = functions
+        self.product_ops = product_ops
+        self.depth = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None, None)
+
+    def advance(self):
+        token = self.peek()
+        if token[0] is None:
+            raise BatchError("fin inesperado de la sentencia")
+        self.pos += 1
+        return token
+
+    def expect(self, value):
+        kind, found, position = self.advance()
+        if found != value:
+            raise BatchError(f"se esperaba {value!r} y se encontró {found!r} en la posición {position}")
+
+    def expression(self):
+        """expr := term (('∪' | '\\') term)*"""
+        self.depth += 1
+        if self.depth > MAX_NESTING:
+            raise BatchError(f"la expresión tiene más de {MAX_NESTING} niveles de anidamiento")
+        value = self.term()
+        while self.peek()[1] in _UNION_OPS:
+            operation = _UNION_OPS[self.advance()[1]]
+            value = operation(value, self.term())
+        self.depth -= 1
+        return value
+
+    def term(self):
+        """term := power (('∩' | '×' | '∘') power)*"""
+        value = self.power()
+        while self.peek()[1] in self.product_ops:
+            operation = self.product_ops[self.advance()[1]]
+            value = operation(value, self.power())
+        return value
+
+    def power(self):
+        """power := atom (('**' | '^') número)?"""
+        value = self.atom()
+        if self.peek()[1] in ('**', '^'):
+            self.advance()
+            kind, exponent, position = self.advance()
+            if kind != 'number':
+                raise BatchError(f"se esperaba un exponente entero en la posición {position}")
+            value = relation_power(value, int(exponent))
+        return value
+
+    def atom(self):
+        kind, value, position = self.advance()
+        if kind == 'set':
+            try:
+                return parse_elements(value[1:-1])
+            except ParseError as error:
+                raise BatchError(f"conjunto mal formado en la posición {position + 1 + error.position}") from error
+        if kind == 'number':
+            return int(value)
+        if value == '(':
+            result = self.expression()
+            self.expect(')')
+            return result
+        if kind == 'name':
+            if self.peek()[1] == '(' and value.lower() in self.functions:
+                return self.call(self.functions[value.lower()])
+            name = value.upper()
+            if name not in self.sets_dict:
+                raise BatchError(f"el conjunto '{name}' no existe (posición {position})")
+            return self.sets_dict[name]
+        raise BatchError(f"token inesperado {value!r} en la posición {position}")
+
+    def call(self, function):
+        self.expect('(')
+        arguments = []
+        if self.peek()[1] != ')':
+            arguments.append(self.expression())
+            while self.peek()[1] == ',':
+                self.advance()
+                arguments.append(self.expression())
+        self.expect(')')
+        try:
+            return function(*arguments)
+        except TypeError as error:
+            raise BatchError(str(error)) from error
+
+    def finish(self):
+        token = self.peek()
+        if token[0] is not None:
+            raise BatchError(f"token inesperado {token[1]!r} en la posición {token[2]}")
+
+def to_json_value(value):
+    """Convierte un resultado a un valor serializable en JSON con orden estable"""
+    if isinstance(value, (bool, int, float, str)) or value is None:
+        return value
+    if isinstance(value, tuple):
+        return [to_json_value(item) for item in value]
+    items = [to_json_value(item) for item in value]
+    return sorted(items, key=lambda item: (type(item).__name__, repr(item)))
+
+def run_script(text, sets_dict=None, out=None, workers=None):
+    """Ejecuta un script por lotes; devuelve el número de sentencias con error
+
+    Con workers >= 2, fun, sim, tra y la composición usan el motor paralelo (parallel.py).
+    """
+    if sets_dict is None:
+        sets_dict = default_sets()
+    if out is None:
+        out = sys.stdout
+    functions = _functions(sets_dict)
+    product_ops = _PRODUCT_OPS
+    if workers is not None and workers >= 2:
+        parallel_functions, product_ops = _parallel_operations(workers)
+        functions.update(parallel_functions)
+    errors = 0
+
+    for line_number, line in enumerate(text.splitlines(), 1):
+        try:
+            statements = list(split_statements(tokenize(line)))
+        except BatchError as error:
+            out.write(json.dumps({"line": line_number, "error": str(error)}, ensure_ascii=False) + "\n")
+            errors += 1
+            continue
+
+        for statement in statements:
+            record = {"line": line_number}
+            try:
+                if len(statement) > 1 and statement[0][0] == 'name' and statement[1][1] == '=':
+                    # Asignación: NOMBRE = expr
+                    name = statement[0][1].upper()
+                    evaluator = _Evaluator(statement[2:], sets_dict, functions, product_ops)
+                    value = evaluator.expression()
+                    evaluator.finish()
+                    sets_dict[name] = value
+                    record["name"] = name
+                    record["size"] = len(value) if hasattr(value, '__len__') else None
+                else:
+                    # Impresión: 'print expr' o una expresión suelta
+                    if statement[0][1] == 'print':
+                        statement = statement[1:]
+                    evaluator = _Evaluator(statement, sets_dict, functions, product_ops)
+                    value = evaluator.expression()
+                    evaluator.finish()
+                    start = statement[0][2]
+                    end = statement[-1][2] + len(statement[-1][1])
+                    record["expr"] = line[start:end]
+                    record["value"] = to_json_value(value)
+            except (BatchError, TypeError, ValueError) as error:
+                record["error"] = str(error)
+                errors += 1
+            except RecursionError:
+                record["error"] = "la expresión está anidada demasiado profundamente"
+                errors += 1
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    return errors
+
+def run_cli(argv):
+    """Punto de entrada del modo por lotes desde la línea de comandos"""
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Evalúa scripts de expresiones sobre conjuntos y relaciones sin menús"
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--batch", metavar="SCRIPT", help="archivo de script ('-' para leer de stdin)")
+    source.add_argument("-e", "--expr", help="script en línea, p. ej. \"R3 = R ** 3; print tra(R, A2)\"")
+    parser.add_argument("--store", metavar="DIR", help="usar un catálogo persistente en lugar de los conjuntos predeterminados")
+    parser.add_argument("--workers", type=int, metavar="N",
+                        help="procesos para fun, sim, tra y ∘ sobre relaciones grandes (por defecto, serial)")
+    args = parser.parse_args(argv)
+
+    if args.expr is not None:
+        text = args.expr
+    elif args.batch == '-':
+        text = sys.stdin.read()
+    else:
+        with open(args.batch, encoding="utf-8") as script:
+            text = script.read()
+
+    sets_dict = None
+    if args.store is not None:
+        from store import Catalog
+        sets_dict = Catalog(args.store)
+    return 1 if run_script(text, sets_dict, workers=args.workers) else 0
@@ -0,0 +1,191 @@
+"""Benchmarks reproducibles de las operaciones de conjuntos y relaciones de core.py
+
+Uso:
+    python bench.py run --sizes 100,1000,10000 --out baseline.json
+    python bench.py compare baseline.json --threshold 1.25
+
+Cada caso usa relaciones generadas con semilla fija (dispersa, densa, aleatoria, cadena
+y clases de equivalencia) y mide el mejor tiempo de varias repeticiones y la memoria
+pico (tracemalloc) de una ejecución aparte.
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import generators
+import core
+
+DEFAULT_SIZES = [100, 1000, 10_000, 100_000]
+DEFAULT_SEED = 2024
+KINDS = ['sparse', 'dense', 'random', 'chain', 'equivalence']
+# Tamaño de cada clase en las relaciones de equivalencia generadas
+EQUIVALENCE_CLASS_SIZE = 10
+# Perfil de generators.py y densidad (en función del tamaño) de cada tipo de relación
+KIND_PROFILES = {
+    'sparse': ('random', lambda size: 1 / (16 * size)),     # grado medio 0.25
+    'dense': ('random', lambda size: 0.5),
+    'random': ('random', lambda size: 4 / size),            # grado medio 2
+    'chain': ('chain', None),
+    'equivalence': ('equivalence', lambda size: EQUIVALENCE_CLASS_SIZE ** 2 / size),
+}
+# Diferencias menores a este tiempo se consideran ruido al comparar
+NOISE_FLOOR_SECONDS = 0.001
+
+def generate_relation(kind, size, seed=DEFAULT_SEED):
+    """Genera una relación de aproximadamente size pares; devuelve (relación, conjunto base)"""
+    if kind not in KIND_PROFILES:
+        raise ValueError(f"tipo de relación desconocido: {kind}")
+    profile, density = KIND_PROFILES[kind]
+    if density is not None:
+        density = min(1.0, density(max(size, 1)))
+    return generators.generate_relation(size, profile, density, seed)
+
+def _format_relation(relation):
+    return ", ".join(f"({a},{b})" for a, b in relation)
+
+def _operations():
+    """Operaciones medidas: nombre -> (prepara argumentos, función, tamaño máximo, por tipo)"""
+    def pair_of_sets(size, seed):
+        rng = random.Random(f"sets-{size}-{seed}")
+        return set(rng.sample(range(2 * size), size)), set(rng.sample(range(2 * size), size))
+
+    def square_sets(size, seed):
+        side = max(1, math.isqrt(size))
+        return set(range(side)), set(range(side, 2 * side))
+
+    def power(relation, n):
+        # Sin clave de conjunto no se usa la caché de potencias: se mide el cálculo completo
+        return core.relation_power(relation, n)
+
+    return {
+        'union': (pair_of_sets, core.union, None, False),
+        'cartesian_product': (square_sets, core.cartesian_product, None, False),
+        'parse_input': (lambda relation, base: (_format_relation(relation),), core.parse_input, None, True),
+        'is_function': (lambda relation, base: (relation, base, base), core.is_function, None, True),
+        'is_reflexive': (lambda relation, base: (relation, base), core.is_reflexive, None, True),
+        'is_symmetric': (lambda relation, base: (relation, base), core.is_symmetric, None, True),
+        'is_transitive': (lambda relation, base: (relation, base), core.is_transitive, None, True),
+        'relation_composition': (lambda relation, base: (relation, relation), core.relation_composition, None, True),
+        'relation_power': (lambda relation, base: (relation, 3), power, 100_000, True),
+        'transitive_closure': (lambda relation, base: (relation,), core.transitive_closure, 1000, True),
+    }
+
+def _measure(function, args, repeat):
+    """Mejor tiempo de repeat ejecuciones y memoria pico de una ejecución aparte"""
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+def run_benchmarks(sizes=DEFAULT_SIZES, operations=None, kinds=KINDS, repeat=3, seed=DEFAULT_SEED, log=None):
+    """Ejecuta los casos y devuelve la lista de resultados"""
+    available = _operations()
+    names = operations or list(available)
+    results = []
+    for size in sizes:
+        relations = {}
+        for name in names:
+            prepare, function, max_size, per_kind = available[name]
+            if max_size is not None and size > max_size:
+                continue
+            for kind in (kinds if per_kind else ['-']):
+                if per_kind:
+                    if kind not in relations:
+                        relations[kind] = generate_relation(kind, size, seed)
+                    args = prepare(*relations[kind])
+                else:
+                    args = prepare(size, seed)
+                seconds, peak = _measure(function, args, repeat)
+                row = {"op": name, "kind": kind, "size": size, "seconds": seconds, "peak_bytes": peak}
+                results.append(row)
+                if log:
+                    log(row)
+    return results
+
+def _print_row(row):
+    print(f"{row['op']:<22} {row['kind']:<12} {row['size']:>9} {row['seconds'] * 1000:>12.3f} ms {row['peak_bytes'] / 1024:>12.1f} KiB")
+    sys.stdout.flush()
+
+def compare(baseline, results, threshold):
+    """Filas cuyo tiempo empeoró más del umbral respecto de la línea base"""
+    previous = {(row["op"], row["kind"], row["size"]): row for row in baseline["results"]}
+    regressions = []
+    for row in results:
+        old = previous.get((row["op"], row["kind"], row["size"]))
+        if old is None:
+            continue
+        if row["seconds"] > threshold * old["seconds"] and row["seconds"] - old["seconds"] > NOISE_FLOOR_SECONDS:
+            regressions.append((row, old))
+    return regressions
+
+def _parse_list(text, convert=str):
+    return [convert(item.strip()) for item in text.split(",") if item.strip()]
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de core.py")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="ejecutar los benchmarks")
+    run_parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)))
+    run_parser.add_argument("--ops", help="operaciones separadas por comas (por defecto, todas)")
+    run_parser.add_argument("--kinds", default=",".join(KINDS))
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    run_parser.add_argument("--out", help="guardar los resultados como línea base JSON")
+
+    compare_parser = commands.add_parser("compare", help="comparar contra una línea base guardada")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("--threshold", type=float, default=1.25,
+                                help="factor de lentitud que se considera regresión (por defecto 1.25)")
+    compare_parser.add_argument("--repeat", type=int)
+
+    args = parser.parse_args(argv)
+    print(f"{'operación':<22} {'tipo':<12} {'tamaño':>9} {'tiempo':>15} {'memoria pico':>16}")
+
+    if args.command == "run":
+        config = {
+            "sizes": _parse_list(args.sizes, int),
+            "operations": _parse_list(args.ops) if args.ops else None,
+            "kinds": _parse_list(args.kinds),
+            "repeat": args.repeat,
+            "seed": args.seed,
+        }
+        results = run_benchmarks(log=_print_row, **config)
+        if args.out:
+            baseline = {
+                "meta": {"python": platform.python_version(), "platform": platform.platform(), "config": config},
+                "results": results,
+            }
+            with open(args.out, "w", encoding="utf-8") as out:
+                json.dump(baseline, out, indent=2)
+            print(f"Línea base guardada en {args.out}")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as source:
+        baseline = json.load(source)
+    config = dict(baseline["meta"]["config"])
+    if args.repeat is not None:
+        config["repeat"] = args.repeat
+    results = run_benchmarks(log=_print_row, **config)
+    regressions = compare(baseline, results, args.threshold)
+    for row, old in regressions:
+        print(f"REGRESIÓN {row['op']} [{row['kind']}, {row['size']}]: "
+              f"{old['seconds'] * 1000:.3f} ms -> {row['seconds'] * 1000:.3f} ms "
+              f"(x{row['seconds'] / old['seconds']:.2f})")
+    print(f"{len(regressions)} regresiones con umbral x{args.threshold}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
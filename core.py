@@ -0,0 +1,1383 @@
+"""Núcleo de conjuntos y relaciones: tipos, propiedades, cerraduras, cachés y entrada/salida
+
+main.py (el menú interactivo) y los módulos auxiliares importan de aquí; este módulo no
+depende de ninguno de ellos salvo por importaciones diferidas dentro de funciones.
+"""
+
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, namedtuple
+from enum import Enum
+from itertools import compress, repeat
+import re
+import sys
+
+def create_set(name, elements):
+    """Crea un conjunto con un nombre dado y elementos"""
+    return {name: set(elements)}
+
+def union(set1, set2):
+    """Calcula la unión de dos conjuntos"""
+    return set1 | set2
+
+def intersection(set1, set2):
+    """Calcula la intersección de dos conjuntos"""
+    return set1 & set2
+
+def difference(set1, set2):
+    """Calcula la diferencia de dos conjuntos (set1 - set2)"""
+    return set1 - set2
+
+def complement(universal, set1):
+    """Calcula el complemento de set1 respecto al conjunto universal"""
+    if isinstance(universal, BitSet) and isinstance(set1, BitSet) and universal.universe is set1.universe:
+        return BitSet(universal.universe, universal.mask & ~set1.mask)
+    return universal - set1
+
+def cartesian_product(set1, set2):
+    """Calcula el producto cartesiano de dos conjuntos"""
+    return {(x, y) for x in set1 for y in set2}
+
+class CartesianProduct:
+    """Vista perezosa de A × B: pertenencia en O(1) sin materializar los pares"""
+    
+    def __init__(self, set1, set2):
+        self.first = set1
+        self.second = set2
+    
+    def __contains__(self, pair):
+        return isinstance(pair, tuple) and len(pair) == 2 and pair[0] in self.first and pair[1] in self.second
+    
+    def __len__(self):
+        return len(self.first) * len(self.second)
+    
+    def __iter__(self):
+        return ((x, y) for x in self.first for y in self.second)
+    
+    def __repr__(self):
+        return repr(self.to_set()) if len(self) else "set()"
+    
+    def to_set(self):
+        """Materializa el producto como conjunto de tuplas"""
+        return cartesian_product(self.first, self.second)
+
+class Universe:
+    """Conjunto universal indexado: cada elemento ocupa una posición de bit"""
+    
+    def __init__(self, elements):
+        self.elements = list(elements)
+        self.position = {element: i for i, element in enumerate(self.elements)}
+        self.full_mask = (1 << len(self.elements)) - 1
+    
+    def mask_of(self, elements):
+        """Devuelve la máscara de bits de los elementos, o None si alguno no está en el universo"""
+        position = self.position
+        mask = 0
+        for element in elements:
+            i = position.get(element)
+            if i is None:
+                return None
+            mask |= 1 << i
+        return mask
+    
+    def bitset(self, elements=()):
+        """Crea un BitSet sobre este universo"""
+        mask = self.mask_of(elements)
+        if mask is None:
+            raise ValueError("Hay elementos que no pertenecen al conjunto universal")
+        return BitSet(self, mask)
+    
+    def __len__(self):
+        return len(self.elements)
+
+class BitSet:
+    """Conjunto finito representado como máscara de bits sobre un Universe"""
+    
+    def __init__(self, universe, mask=0):
+        self.universe = universe
+        self.mask = mask
+    
+    def _other_mask(self, other):
+        """Máscara de otro conjunto sobre el mismo universo, o None si no es convertible"""
+        if isinstance(other, BitSet):
+            return other.mask if other.universe is self.universe else None
+        if isinstance(other, (set, frozenset)):
+            return self.universe.mask_of(other)
+        return None
+    
+    def __or__(self, other):
+        mask = self._other_mask(other)
+        if mask is None:
+            return self.to_set() | set(other)
+        return BitSet(self.universe, self.mask | mask)
+    
+    def __and__(self, other):
+        mask = self._other_mask(other)
+        if mask is None:
+            return self.to_set() & set(other)
+        return BitSet(self.universe, self.mask & mask)
+    
+    def __sub__(self, other):
+        mask = self._other_mask(other)
+        if mask is None:
+            return self.to_set() - set(other)
+        return BitSet(self.universe, self.mask & ~mask)
+    
+    def __rsub__(self, other):
+        mask = self._other_mask(other)
+        if mask is None:
+            return set(other) - self.to_set()
+        return BitSet(self.universe, mask & ~self.mask)
+    
+    __ror__ = __or__
+    __rand__ = __and__
+    
+    def complement(self):
+        """Complemento respecto a todo el universo"""
+        return BitSet(self.universe, self.universe.full_mask & ~self.mask)
+    
+    def __len__(self):
+        return self.mask.bit_count()
+    
+    def __iter__(self):
+        elements = self.universe.elements
+        return (elements[i] for i in _bit_positions(self.mask))
+    
+    def __contains__(self, element):
+        i = self.universe.position.get(element)
+        return i is not None and bool(self.mask >> i & 1)
+    
+    def __eq__(self, other):
+        if isinstance(other, BitSet) and other.universe is self.universe:
+            return self.mask == other.mask
+        if isinstance(other, (set, frozenset)):
+            return self.to_set() == other
+        return NotImplemented
+    
+    def __le__(self, other):
+        mask = self._other_mask(other)
+        if mask is None:
+            return self.to_set() <= set(other)
+        return self.mask & ~mask == 0
+    
+    def issubset(self, other):
+        return self <= other
+    
+    def __repr__(self):
+        return repr(self.to_set()) if self.mask else "set()"
+    
+    def to_set(self):
+        """Convierte el BitSet a un set de Python"""
+        return set(self)
+
+def to_bitsets(sets_dict, universe_name='U'):
+    """Convierte a BitSet los conjuntos contenidos en el universal (modo BitSet)"""
+    universe = Universe(sets_dict[universe_name])
+    for name, conjunto in sets_dict.items():
+        if isinstance(conjunto, set):
+            mask = universe.mask_of(conjunto)
+            if mask is not None:
+                sets_dict[name] = BitSet(universe, mask)
+    return universe
+
+def from_bitsets(sets_dict):
+    """Devuelve todos los BitSet del diccionario a su forma de set"""
+    for name, conjunto in sets_dict.items():
+        if isinstance(conjunto, BitSet):
+            sets_dict[name] = conjunto.to_set()
+
+class Relation:
+    """Relación binaria compacta: elementos internados como ids enteros y pares en formato CSR"""
+    
+    def __init__(self, pairs=()):
+        # Tabla de símbolos: elemento -> id denso, e id -> elemento
+        self.symbols = {}
+        self.elements = []
+        keys = set()
+        for a, b in pairs:
+            keys.add(self._intern(a) << 32 | self._intern(b))
+        self._build(keys)
+    
+    @classmethod
+    def from_columns(cls, elements, offsets, targets):
+        """Construye una relación sobre columnas ya ordenadas (p. ej. vistas de un archivo mapeado)"""
+        relation = cls.__new__(cls)
+        relation.elements = elements
+        relation.symbols = {element: i for i, element in enumerate(elements)}
+        relation.offsets = offsets
+        relation.targets = targets
+        return relation
+    
+    @classmethod
+    def _from_rows(cls, elements, symbols, offsets, targets):
+        """Construye una relación sobre columnas CSR ya armadas, compartiendo la tabla de símbolos"""
+        relation = cls.__new__(cls)
+        relation.elements = elements
+        relation.symbols = symbols
+        relation.offsets = offsets
+        relation.targets = targets
+        return relation
+    
+    def _intern(self, element):
+        """Devuelve el id de un elemento, registrándolo si es nuevo"""
+        element_id = self.symbols.get(element)
+        if element_id is None:
+            element_id = self.symbols[element] = len(self.elements)
+            self.elements.append(element)
+        return element_id
+    
+    def _build(self, keys):
+        """Ordena los pares por (origen, destino) y arma los desplazamientos de cada fila"""
+        ordered = sorted(keys)
+        self.targets = array('I', [key & 0xFFFFFFFF for key in ordered])
+        offsets = array('Q', bytes(8 * (len(self.elements) + 1)))
+        for key in ordered:
+            offsets[(key >> 32) + 1] += 1
+        for i in range(1, len(offsets)):
+            offsets[i] += offsets[i - 1]
+        self.offsets = offsets
+    
+    def __len__(self):
+        return len(self.targets)
+    
+    def __iter__(self):
+        elements = self.elements
+        targets = self.targets
+        offsets = self.offsets
+        for i, a in enumerate(elements):
+            for j in range(offsets[i], offsets[i + 1]):
+                yield (a, elements[targets[j]])
+    
+    def __contains__(self, pair):
+        try:
+            a, b = pair
+        except (TypeError, ValueError):
+            return False
+        i = self.symbols.get(a)
+        j = self.symbols.get(b)
+        if i is None or j is None:
+            return False
+        return self.has_ids(i, j)
+    
+    def __eq__(self, other):
+        if isinstance(other, Relation):
+            other = other.to_set()
+        return self.to_set() == other
+    
+    def __repr__(self):
+        return f"Relation({self.to_set()})"
+    
+    # Operaciones de conjuntos con sets normales (el resultado es un set)
+    def __or__(self, other):
+        return self.to_set() | set(other)
+    
+    def __and__(self, other):
+        return self.to_set() & set(other)
+    
+    def __sub__(self, other):
+        return self.to_set() - set(other)
+    
+    def __rsub__(self, other):
+        return set(other) - self.to_set()
+    
+    __ror__ = __or__
+    __rand__ = __and__
+    
+    def issubset(self, other):
+        return all(pair in other for pair in self)
+    
+    def copy(self):
+        return self.to_set()
+    
+    def has_ids(self, i, j):
+        """Verifica si el par de ids (i,j) está en la relación (búsqueda binaria en la fila de i)"""
+        start, end = self.offsets[i], self.offsets[i + 1]
+        k = bisect_left(self.targets, j, start, end)
+        return k < end and self.targets[k] == j
+    
+    def row(self, i):
+        """Devuelve los ids de los sucesores del id i"""
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+    
+    def transpose(self):
+        """Columnas CSR (offsets, targets) de la relación inversa, con las filas ordenadas
+        
+        Se calcula una vez por relación (ordenamiento por conteo) y se guarda.
+        """
+        transposed = getattr(self, '_transposed', None)
+        if transposed is None:
+            offsets, targets = self.offsets, self.targets
+            n = len(self.elements)
+            counts = [0] * (n + 1)
+            for j in targets:
+                counts[j + 1] += 1
+            for j in range(n):
+                counts[j + 1] += counts[j]
+            # Recorrer las filas en orden deja cada fila transpuesta ya ordenada
+            position = counts[:n]
+            sources = array('I', bytes(4 * len(targets)))
+            for i in range(n):
+                for j in targets[offsets[i]:offsets[i + 1]]:
+                    sources[position[j]] = i
+                    position[j] += 1
+            transposed = self._transposed = (array('Q', counts), sources)
+        return transposed
+    
+    def to_set(self):
+        """Convierte la relación a un conjunto de tuplas"""
+        return set(self)
+
+class BoolMatrix:
+    """Relación como matriz booleana empaquetada: cada fila es un entero con un bit por columna"""
+    
+    def __init__(self, elements, rows=None):
+        self.elements = list(elements)
+        self.position = {element: i for i, element in enumerate(self.elements)}
+        self.rows = rows if rows is not None else [0] * len(self.elements)
+    
+    @classmethod
+    def from_relation(cls, relation, elements=None):
+        """Construye la matriz de adyacencia de una relación (opcionalmente sobre elementos dados)"""
+        if elements is None:
+            elements = {x for pair in relation for x in pair}
+        matrix = cls(elements)
+        position = matrix.position
+        rows = matrix.rows
+        for a, b in relation:
+            rows[position[a]] |= 1 << position[b]
+        return matrix
+    
+    def mask_of(self, elements):
+        """Máscara de columnas de los elementos dados que aparecen en la matriz"""
+        mask = 0
+        for element in elements:
+            i = self.position.get(element)
+            if i is not None:
+                mask |= 1 << i
+        return mask
+    
+    def compose(self, other):
+        """Producto booleano M·N (ambas matrices sobre los mismos elementos)"""
+        other_rows = other.rows
+        rows = []
+        for row in self.rows:
+            acc = 0
+            for j in _bit_positions(row):
+                acc |= other_rows[j]
+            rows.append(acc)
+        return BoolMatrix(self.elements, rows)
+    
+    def transpose(self):
+        """Matriz transpuesta (relación inversa)"""
+        columns = [0] * len(self.elements)
+        for i, row in enumerate(self.rows):
+            bit = 1 << i
+            for j in _bit_positions(row):
+                columns[j] |= bit
+        return BoolMatrix(self.elements, columns)
+    
+    def is_reflexive(self, base_set):
+        """diag(M) encendida para todo elemento del conjunto base"""
+        for element in base_set:
+            i = self.position.get(element)
+            if i is None or not self.rows[i] >> i & 1:
+                return False
+        return True
+    
+    def is_symmetric(self, base_set):
+        """M == Mᵀ restringida al conjunto base"""
+        base = self.mask_of(base_set)
+        transposed = self.transpose().rows
+        for i in _bit_positions(base):
+            if (self.rows[i] ^ transposed[i]) & base:
+                return False
+        return True
+    
+    def find_transitivity_violation(self, base_set):
+        """(M·M) ⊆ M restringida al conjunto base; devuelve un contraejemplo (a,b,d) o None"""
+        base = self.mask_of(base_set)
+        rows = self.rows
+        elements = self.elements
+        for i in _bit_positions(base):
+            row = rows[i] & base
+            for j in _bit_positions(row):
+                missing = rows[j] & base & ~row
+                if missing:
+                    d = missing.bit_length() - 1
+                    return (elements[i], elements[j], elements[d])
+        return None
+    
+    def __len__(self):
+        return sum(row.bit_count() for row in self.rows)
+    
+    def __iter__(self):
+        elements = self.elements
+        for i, row in enumerate(self.rows):
+            a = elements[i]
+            for j in _bit_positions(row):
+                yield (a, elements[j])
+    
+    def __repr__(self):
+        return f"BoolMatrix({self.to_set()})"
+    
+    def to_set(self):
+        """Convierte la matriz a un conjunto de tuplas"""
+        return set(self)
+
+# Densidad mínima (|R| / n²) y tamaño mínimo a partir de los cuales conviene la matriz
+MATRIX_MIN_DENSITY = 0.02
+MATRIX_MIN_ELEMENTS = 64
+# Pares de una Relation que is_symmetric revisa uno a uno antes de construir la transpuesta
+SYMMETRY_PROBE_PAIRS = 1024
+
+def _dense_elements(*relations):
+    """Elementos comunes si las relaciones son lo bastante densas para usar la matriz, o None"""
+    size = sum(len(relation) for relation in relations)
+    if size < MATRIX_MIN_DENSITY * MATRIX_MIN_ELEMENTS ** 2:
+        return None
+    elements = set()
+    for relation in relations:
+        for pair in relation:
+            elements.update(pair)
+    n = len(elements)
+    if n < MATRIX_MIN_ELEMENTS or size < MATRIX_MIN_DENSITY * n * n:
+        return None
+    return list(elements)
+
+class FunctionReason(Enum):
+    """Motivo del veredicto de check_function"""
+    OK = "es función"
+    NOT_A_RELATION = "no es una relación (no contiene solo tuplas de 2 elementos)"
+    MULTIPLE_IMAGES = "un elemento tiene múltiples imágenes"
+    OUTSIDE_DOMAIN = "hay elementos en la relación que no están en el dominio"
+    OUTSIDE_CODOMAIN = "hay elementos en el rango que no están en el codominio"
+
+# Resultado de check_function. witness depende del motivo: el elemento que no es par,
+# (x, y1, y2) para múltiples imágenes, o el par cuyo componente queda fuera.
+# is_total/is_injective/is_surjective solo se calculan si se piden y R es función.
+FunctionCheck = namedtuple(
+    'FunctionCheck',
+    ['is_function', 'reason', 'witness', 'is_total', 'is_injective', 'is_surjective'],
+    defaults=(None, None, None, None)
+)
+
+def check_function(relation, domain_set, codomain_set, properties=False, stop_early=False):
+    """Verifica en una sola pasada si una relación (cualquier iterable de pares) es función
+    
+    NOT_A_RELATION tiene prioridad sobre los demás motivos: tras el primer par que
+    incumple solo se sigue buscando un elemento que no sea par. Con stop_early se
+    devuelve el primer incumplimiento (mismo veredicto, pero el motivo puede variar).
+    """
+    # Los pares de una Relation o de A × B siempre son tuplas de 2 elementos
+    stop_early = stop_early or isinstance(relation, (Relation, CartesianProduct))
+    mapping = {}
+    failure = None
+    for item in relation:
+        if not (isinstance(item, tuple) and len(item) == 2):
+            return FunctionCheck(False, FunctionReason.NOT_A_RELATION, item)
+        if failure is not None:
+            continue
+        x, y = item
+        if x not in domain_set:
+            failure = FunctionCheck(False, FunctionReason.OUTSIDE_DOMAIN, item)
+        elif y not in codomain_set:
+            failure = FunctionCheck(False, FunctionReason.OUTSIDE_CODOMAIN, item)
+        else:
+            previous = mapping.setdefault(x, y)
+            if previous != y:
+                failure = FunctionCheck(False, FunctionReason.MULTIPLE_IMAGES, (x, previous, y))
+        if failure is not None and stop_early:
+            return failure
+    if failure is not None:
+        return failure
+    
+    if not properties:
+        return FunctionCheck(True, FunctionReason.OK)
+    images = set(mapping.values())
+    return FunctionCheck(
+        True, FunctionReason.OK, None,
+        is_total=len(mapping) == len(domain_set),
+        is_injective=len(images) == len(mapping),
+        is_surjective=len(images) == len(codomain_set)
+    )
+
+def is_function(relation, domain_set, codomain_set):
+    """Verifica si una relación es una función"""
+    if isinstance(relation, CartesianProduct):
+        # A × B es función si está vacío o si B tiene un único elemento
+        if not len(relation):
+            return True
+        return (len(relation.second) == 1 and all(x in domain_set for x in relation.first)
+                and all(y in codomain_set for y in relation.second))
+    if isinstance(relation, Relation):
+        # Cada fila debe tener a lo sumo una imagen
+        offsets = relation.offsets
+        for i, x in enumerate(relation.elements):
+            count = offsets[i + 1] - offsets[i]
+            if count > 1:
+                return False
+            if count == 1 and (x not in domain_set or relation.elements[relation.targets[offsets[i]]] not in codomain_set):
+                return False
+        return True
+    # Si no es un conjunto (de tuplas), no puede ser función
+    if not isinstance(relation, set):
+        return False
+    return check_function(relation, domain_set, codomain_set, stop_early=True).is_function
+
+def is_binary_relation(relation, set1, set2):
+    """Verifica si una relación es binaria entre dos conjuntos (bin(R,A,B))"""
+    if not isinstance(relation, (set, Relation)):
+        return False
+    
+    # Verificar en una sola pasada que cada elemento sea un par de A × B,
+    # consultando la pertenencia sin construir el producto cartesiano
+    product = CartesianProduct(set1, set2)
+    return all(item in product for item in relation)
+
+def is_reflexive(relation, base_set):
+    """Verifica si una relación es reflexiva en un conjunto (ref(R,A))"""
+    if isinstance(relation, BoolMatrix):
+        return relation.is_reflexive(base_set)
+    if not isinstance(relation, (set, Relation)):
+        return False
+    
+    # Para ser reflexiva, debe contener (a,a) para todo a en el conjunto base
+    for element in base_set:
+        if (element, element) not in relation:
+            return False
+    return True
+
+def is_symmetric(relation, base_set):
+    """Verifica si una relación es simétrica (sim(R,A))"""
+    if isinstance(relation, BoolMatrix):
+        return relation.is_symmetric(base_set)
+    if isinstance(relation, Relation):
+        offsets, targets = relation.offsets, relation.targets
+        in_base = bytes(map(base_set.__contains__, relation.elements))
+        # Las relaciones no simétricas suelen fallar en los primeros pares: revisarlos
+        # antes de construir la transpuesta
+        checked = 0
+        for i in compress(range(len(in_base)), in_base):
+            for j in targets[offsets[i]:offsets[i + 1]]:
+                if in_base[j] and not relation.has_ids(j, i):
+                    return False
+                checked += 1
+            if checked >= SYMMETRY_PROBE_PAIRS:
+                break
+        # R es simétrica si cada fila coincide con la misma fila de la transpuesta
+        reverse_offsets, sources = relation.transpose()
+        if in_base.count(1) == len(in_base):
+            return offsets == reverse_offsets and targets == sources
+        for i in compress(range(len(in_base)), in_base):
+            row = targets[offsets[i]:offsets[i + 1]]
+            reverse_row = sources[reverse_offsets[i]:reverse_offsets[i + 1]]
+            if row != reverse_row and (list(compress(row, map(in_base.__getitem__, row)))
+                                       != list(compress(reverse_row, map(in_base.__getitem__, reverse_row)))):
+                return False
+        return True
+    if not isinstance(relation, set):
+        return False
+    
+    # Para ser simétrica, si (a,b) está en R, entonces (b,a) debe estar en R
+    for a, b in relation:
+        # Solo verificar pares donde ambos elementos están en el conjunto base
+        if a in base_set and b in base_set:
+            if (b, a) not in relation:
+                return False
+    return True
+
+def find_transitivity_violation(relation, base_set):
+    """Busca un contraejemplo de transitividad: (a,b,d) con (a,b),(b,d) en R pero (a,d) no"""
+    if isinstance(relation, BoolMatrix):
+        return relation.find_transitivity_violation(base_set)
+    if isinstance(relation, set):
+        # Relaciones densas: comprobar (M·M) ⊆ M sobre la matriz de bits
+        elements = _dense_elements(relation)
+        if elements is not None:
+            return BoolMatrix.from_relation(relation, elements).find_transitivity_violation(base_set)
+    if isinstance(relation, Relation):
+        # Sobre la representación compacta se usan directamente las filas de ids
+        elements = relation.elements
+        in_base = [element in base_set for element in elements]
+        for a in range(len(elements)):
+            if not in_base[a]:
+                continue
+            a_successors = {b for b in relation.row(a) if in_base[b]}
+            for b in a_successors:
+                for d in relation.row(b):
+                    if in_base[d] and d not in a_successors:
+                        return (elements[a], elements[b], elements[d])
+        return None
+    
+    # Índice de sucesores restringido al conjunto base: a -> {b | (a,b) en R}
+    successors = {}
+    for a, b in relation:
+        if a in base_set and b in base_set:
+            if a in successors:
+                successors[a].add(b)
+            else:
+                successors[a] = {b}
+    
+    # Para ser transitiva, los sucesores de cada b deben estar entre los sucesores de a
+    for a, a_successors in successors.items():
+        for b in a_successors:
+            b_successors = successors.get(b)
+            if b_successors and not b_successors <= a_successors:
+                d = next(iter(b_successors - a_successors))
+                return (a, b, d)
+    return None
+
+def is_transitive(relation, base_set):
+    """Verifica si una relación es transitiva (tra(R,A))"""
+    if not isinstance(relation, (set, Relation, BoolMatrix)):
+        return False
+    
+    return find_transitivity_violation(relation, base_set) is None
+
+def _strongly_connected_components(successors, nodes):
+    """Componentes fuertemente conexas (Tarjan iterativo), en orden topológico inverso"""
+    index = {}
+    lowlink = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+    
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        # Pila explícita de (nodo, iterador de sucesores) para no depender de la recursión
+        work = [(root, iter(successors.get(root, ())))]
+        while work:
+            v, children = work[-1]
+            for w in children:
+                if w not in index:
+                    index[w] = lowlink[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack.add(w)
+                    work.append((w, iter(successors.get(w, ()))))
+                    break
+                elif w in on_stack:
+                    lowlink[v] = min(lowlink[v], index[w])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[v])
+                if lowlink[v] == index[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        component.append(w)
+                        if w == v:
+                            break
+                    components.append(component)
+    return components
+
+def _bit_positions(mask):
+    """Devuelve las posiciones de los bits encendidos de un entero"""
+    return [i for i, bit in enumerate(bin(mask)[:1:-1]) if bit == '1']
+
+def _plain_relation(relation):
+    """Convierte una Relation compacta a set para las operaciones que trabajan con tuplas"""
+    return relation.to_set() if isinstance(relation, Relation) else relation
+
+def transitive_closure(relation):
+    """Calcula la cerradura transitiva de una relación (R⁺)"""
+    relation = _plain_relation(relation)
+    if not isinstance(relation, set):
+        return set()
+    
+    successors = build_relation_index(relation)
+    nodes = list({x for pair in relation for x in pair})
+    position = {node: i for i, node in enumerate(nodes)}
+    
+    # Condensar en componentes fuertemente conexas; Tarjan las entrega con los
+    # sumideros primero, así que los alcanzables de cada sucesor ya están calculados
+    components = _strongly_connected_components(successors, nodes)
+    component_of = {}
+    members_mask = []
+    reach_mask = []
+    for c, component in enumerate(components):
+        members = 0
+        for v in component:
+            component_of[v] = c
+            members |= 1 << position[v]
+        
+        # Alcanzables en al menos un paso, propagados como bitsets
+        reach = 0
+        cyclic = len(component) > 1
+        for v in component:
+            for w in successors.get(v, ()):
+                d = component_of[w]
+                if d == c:
+                    cyclic = True
+                else:
+                    reach |= members_mask[d] | reach_mask[d]
+        if cyclic:
+            reach |= members
+        members_mask.append(members)
+        reach_mask.append(reach)
+    
+    closure = set()
+    for c, component in enumerate(components):
+        targets = [nodes[i] for i in _bit_positions(reach_mask[c])]
+        for v in component:
+            closure.update((v, t) for t in targets)
+    return closure
+
+def reflexive_closure(relation, base_set):
+    """Calcula la cerradura reflexiva de una relación en un conjunto"""
+    relation = _plain_relation(relation)
+    if not isinstance(relation, set):
+        return set()
+    return relation | {(a, a) for a in base_set}
+
+def symmetric_closure(relation):
+    """Calcula la cerradura simétrica de una relación"""
+    relation = _plain_relation(relation)
+    if not isinstance(relation, set):
+        return set()
+    return relation | {(b, a) for a, b in relation}
+
+def reflexive_transitive_closure(relation, base_set):
+    """Calcula la cerradura reflexiva y transitiva de una relación (R*)"""
+    return reflexive_closure(transitive_closure(relation), base_set)
+
+def equivalence_closure(relation, base_set):
+    """Calcula la menor relación de equivalencia en el conjunto que contiene a R"""
+    # Unión-búsqueda en tiempo casi lineal (ver equivalence.py)
+    from equivalence import equivalence_closure as closure
+    return closure(relation, base_set)
+
+def build_relation_index(relation):
+    """Construye un índice de una relación: primer componente -> conjunto de segundos componentes"""
+    index = {}
+    for a, b in relation:
+        if a in index:
+            index[a].add(b)
+        else:
+            index[a] = {b}
+    return index
+
+def _composition_tables(relation1, relation2):
+    """Tabla de símbolos del resultado y traducción de ids para componer dos relaciones compactas"""
+    elements = list(relation1.elements)
+    symbols = dict(relation1.symbols)
+    
+    # Traducir ids: destinos de R1 -> orígenes de R2, y destinos de R2 -> ids del resultado
+    to_second = [relation2.symbols.get(element, -1) for element in relation1.elements]
+    from_second = []
+    for element in relation2.elements:
+        element_id = symbols.get(element)
+        if element_id is None:
+            element_id = symbols[element] = len(elements)
+            elements.append(element)
+        from_second.append(element_id)
+    return elements, symbols, to_second, from_second
+
+def _compact_composition(relation1, relation2):
+    """Composición sobre relaciones compactas, trabajando con ids en lugar de tuplas
+    
+    Las filas del resultado se arman en orden de origen y se agregan directamente a las
+    columnas CSR, sin un conjunto global de pares que haya que volver a ordenar.
+    """
+    elements, symbols, to_second, from_second = _composition_tables(relation1, relation2)
+    offsets1, targets1 = relation1.offsets, relation1.targets
+    offsets2, targets2 = relation2.offsets, relation2.targets
+    
+    offsets = array('Q', [0])
+    targets = array('I')
+    for a in range(len(relation1.elements)):
+        row = set()
+        for b in targets1[offsets1[a]:offsets1[a + 1]]:
+            b2 = to_second[b]
+            if b2 >= 0:
+                row.update(targets2[offsets2[b2]:offsets2[b2 + 1]])
+        if row:
+            targets.extend(sorted(map(from_second.__getitem__, row)))
+        offsets.append(len(targets))
+    # Los elementos que solo aparecen en R2 no tienen sucesores en el resultado
+    offsets.extend(repeat(len(targets), len(elements) - len(relation1.elements)))
+    return Relation._from_rows(elements, symbols, offsets, targets)
+
+def relation_composition(relation1, relation2, index2=None):
+    """Calcula la composición de dos relaciones (R∘S)"""
+    if isinstance(relation1, Relation) and isinstance(relation2, Relation):
+        return _compact_composition(relation1, relation2)
+    if isinstance(relation1, BoolMatrix) and isinstance(relation2, BoolMatrix):
+        if relation1.elements != relation2.elements:
+            relation2 = BoolMatrix.from_relation(relation2, relation1.elements + [x for x in relation2.elements if x not in relation1.position])
+            relation1 = BoolMatrix.from_relation(relation1, relation2.elements)
+        return relation1.compose(relation2)
+    relation1 = _plain_relation(relation1)
+    relation2 = _plain_relation(relation2)
+    if not isinstance(relation1, set) or not isinstance(relation2, set):
+        return set()
+    
+    # Indexar R2 por su primer componente (o reutilizar un índice ya construido)
+    if index2 is None:
+        # Relaciones densas: producto booleano de matrices de bits
+        elements = _dense_elements(relation1, relation2)
+        if elements is not None:
+            matrix1 = BoolMatrix.from_relation(relation1, elements)
+            return matrix1.compose(BoolMatrix.from_relation(relation2, elements)).to_set()
+        index2 = build_relation_index(relation2)
+    
+    composition = set()
+    
+    # Para cada par (a,b) en R1, los pares (b,d) de R2 se obtienen del índice
+    # y entonces (a,d) está en la composición
+    for a, b in relation1:
+        images = index2.get(b)
+        if images:
+            composition.update((a, d) for d in images)
+    
+    return composition
+
+class PowerCache:
+    """Caché LRU de potencias ya calculadas: clave del conjunto -> {n: R^n}
+    
+    La clave es (nombre, versión) del conjunto, como en ResultCache, así que una
+    consulta no recorre la relación. El límite es el total de pares guardados entre
+    todas las potencias, no solo el número de relaciones.
+    """
+    
+    def __init__(self, max_pairs=1_000_000, max_relations=32):
+        self.max_pairs = max_pairs
+        self.max_relations = max_relations
+        self.entries = OrderedDict()
+        # Pares de cada entrada al guardarla: el diccionario devuelto por get() puede crecer
+        self.sizes = {}
+        self.pairs = 0
+    
+    def get(self, key):
+        powers = self.entries.get(key)
+        if powers is not None:
+            self.entries.move_to_end(key)
+        return powers
+    
+    def store(self, key, powers):
+        """Guarda (o actualiza) las potencias de una relación y descarta las más antiguas"""
+        self._discard(key)
+        size = sum(map(len, powers.values()))
+        if size > self.max_pairs:
+            # No cabe ni sola: se calcula, pero no se guarda
+            return
+        self.entries[key] = powers
+        self.sizes[key] = size
+        self.pairs += size
+        while self.pairs > self.max_pairs or len(self.entries) > self.max_relations:
+            self._discard(next(iter(self.entries)))
+    
+    def _discard(self, key):
+        if self.entries.pop(key, None) is not None:
+            self.pairs -= self.sizes.pop(key)
+    
+    def invalidate(self, name):
+        """Descarta las potencias de las versiones anteriores del conjunto con ese nombre"""
+        for key in [key for key in self.entries if key[0] == name]:
+            self._discard(key)
+    
+    def clear(self):
+        self.entries.clear()
+        self.sizes.clear()
+        self.pairs = 0
+
+_power_cache = PowerCache()
+
+def _compose_powers(powers, m, k, index_cache):
+    """Calcula R^(m+k) = R^m ∘ R^k a partir de potencias ya conocidas y la guarda"""
+    if m + k not in powers:
+        if _dense_elements(powers[m], powers[k]) is not None:
+            powers[m + k] = frozenset(relation_composition(set(powers[m]), set(powers[k])))
+            return powers[m + k]
+        if k not in index_cache:
+            index_cache[k] = build_relation_index(powers[k])
+        result = relation_composition(set(powers[m]), set(powers[k]), index_cache[k])
+        powers[m + k] = frozenset(result)
+    return powers[m + k]
+
+def _compute_power(powers, power):
+    """Calcula R^n completando el diccionario de potencias conocidas"""
+    if power in powers:
+        return powers[power]
+    
+    index_cache = {}
+    
+    # Elevar al cuadrado repetidamente: R, R^2, R^4, ...
+    # Si R^(2k) == R^k la sucesión es periódica (periodo divisor de k) a partir de k,
+    # así que R^n = R^(k + (n - k) mod k) y se puede saltar directamente a la respuesta
+    k = 1
+    while 2 * k <= power:
+        square = _compose_powers(powers, k, k, index_cache)
+        if not square:
+            # R^(2k) vacía: todas las potencias mayores también lo son
+            return square
+        if square == powers[k]:
+            power = k + (power - k) % k
+            break
+        k *= 2
+    
+    if power in powers:
+        return powers[power]
+    
+    # Partir de la mayor potencia conocida que no exceda n y completar con cuadrados
+    start = max(m for m in powers if m <= power)
+    result_exp = start
+    remaining = power - start
+    while remaining:
+        step = 1 << (remaining.bit_length() - 1)
+        while step not in powers:
+            step //= 2
+        _compose_powers(powers, result_exp, step, index_cache)
+        result_exp += step
+        remaining -= step
+    
+    return powers[power]
+
+def relation_power(relation, power, key=None):
+    """Calcula la potencia de una relación (R^n)
+    
+    Con key = (nombre, versión) del conjunto, las potencias calculadas se guardan en
+    _power_cache y se reutilizan mientras el conjunto no cambie.
+    """
+    if power < 1:
+        return set()
+    
+    powers = _power_cache.get(key) if key is not None else None
+    if powers is None:
+        relation = _plain_relation(relation)
+        if not isinstance(relation, set):
+            return set()
+        if power == 1:
+            return relation.copy()
+        powers = {1: frozenset(relation)}
+    elif power in powers:
+        return set(powers[power])
+    
+    result = _compute_power(powers, power)
+    if key is not None:
+        _power_cache.store(key, powers)
+    return set(result)
+
+# Versión de cada conjunto con nombre: cambia al crearlo, editarlo o eliminarlo
+_set_versions = {}
+
+class ResultCache:
+    """Caché LRU de resultados, con claves (operación, operandos con su versión, parámetros)"""
+    
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get_or_compute(self, key, compute):
+        """Devuelve el resultado guardado para la clave o lo calcula y lo guarda"""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        result = compute()
+        self.entries[key] = result
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return result
+    
+    def invalidate(self, name):
+        """Descarta los resultados que dependen del conjunto con ese nombre"""
+        stale = [key for key in self.entries if any(operand == name for operand, _ in key[1])]
+        for key in stale:
+            del self.entries[key]
+    
+    def clear(self):
+        self.entries.clear()
+
+_result_cache = ResultCache()
+
+class RelationTracker:
+    """Mantiene incrementalmente las propiedades de una relación ante altas y bajas de pares
+    
+    Cada alta o baja cuesta tiempo proporcional al grado de los elementos del par,
+    no al tamaño de la relación.
+    """
+    
+    def __init__(self, relation, base_set, domain_set=None, codomain_set=None):
+        self.base_set = set(base_set)
+        self.domain_set = self.base_set if domain_set is None else set(domain_set)
+        self.codomain_set = self.base_set if codomain_set is None else set(codomain_set)
+        self.pairs = set()
+        # Índices de adyacencia restringidos al conjunto base
+        self.successors = {}
+        self.predecessors = {}
+        # Indicadores: diagonal faltante, pares sin espejo, triples que rompen la transitividad
+        self.missing_diagonal = len(self.base_set)
+        self.unmatched_mirrors = 0
+        self.transitivity_violations = 0
+        # Para la funcionalidad: número de imágenes por elemento y pares fuera de dominio/codominio
+        self.image_counts = {}
+        self.multi_valued_keys = 0
+        self.outside_domain = 0
+        self.outside_codomain = 0
+        for pair in relation:
+            self.add(pair)
+    
+    def add(self, pair):
+        """Agrega un par y actualiza los indicadores"""
+        if pair in self.pairs:
+            return
+        x, y = pair
+        count = self.image_counts.get(x, 0) + 1
+        self.image_counts[x] = count
+        if count == 2:
+            self.multi_valued_keys += 1
+        self.outside_domain += x not in self.domain_set
+        self.outside_codomain += y not in self.codomain_set
+        
+        if x in self.base_set and y in self.base_set:
+            successors = self.successors
+            x_successors = successors.setdefault(x, set())
+            # Triples (x,b,y) que este par cierra
+            closed = len(x_successors & self.predecessors.get(y, set()))
+            if x == y:
+                self.missing_diagonal -= 1
+            elif y in successors and x in successors[y]:
+                self.unmatched_mirrors -= 1
+            else:
+                self.unmatched_mirrors += 1
+            x_successors.add(y)
+            self.predecessors.setdefault(y, set()).add(x)
+            # Triples nuevos con (x,y) como primer o segundo tramo
+            opened = sum(1 for d in successors.get(y, ()) if d not in x_successors)
+            opened += sum(1 for a in self.predecessors.get(x, ()) if y not in successors[a])
+            self.transitivity_violations += opened - closed
+        self.pairs.add(pair)
+    
+    def remove(self, pair):
+        """Elimina un par y actualiza los indicadores"""
+        if pair not in self.pairs:
+            return
+        x, y = pair
+        count = self.image_counts[x] - 1
+        if count:
+            self.image_counts[x] = count
+        else:
+            del self.image_counts[x]
+        if count == 1:
+            self.multi_valued_keys -= 1
+        self.outside_domain -= x not in self.domain_set
+        self.outside_codomain -= y not in self.codomain_set
+        
+        if x in self.base_set and y in self.base_set:
+            successors = self.successors
+            x_successors = successors[x]
+            # Triples que dejan de existir por perder el tramo (x,y)
+            lost = sum(1 for d in successors.get(y, ()) if d not in x_successors)
+            lost += sum(1 for a in self.predecessors.get(x, ()) if y not in successors[a])
+            x_successors.discard(y)
+            self.predecessors[y].discard(x)
+            if x == y:
+                self.missing_diagonal += 1
+            elif x in successors.get(y, ()):
+                self.unmatched_mirrors += 1
+            else:
+                self.unmatched_mirrors -= 1
+            # Triples (x,b,y) que quedan sin cerrar
+            gained = len(x_successors & self.predecessors.get(y, set()))
+            self.transitivity_violations += gained - lost
+        self.pairs.discard(pair)
+    
+    def update(self, added=(), removed=()):
+        """Aplica un lote de altas y bajas"""
+        for pair in removed:
+            self.remove(pair)
+        for pair in added:
+            self.add(pair)
+    
+    def is_reflexive(self):
+        return self.missing_diagonal == 0
+    
+    def is_symmetric(self):
+        return self.unmatched_mirrors == 0
+    
+    def is_transitive(self):
+        return self.transitivity_violations == 0
+    
+    def is_function(self):
+        return self.multi_valued_keys == 0 and self.outside_domain == 0 and self.outside_codomain == 0
+
+# Trackers activos: (nombre de la relación, nombre del conjunto base) -> RelationTracker
+_trackers = {}
+
+def _is_pair_set(elements):
+    return all(isinstance(item, tuple) and len(item) == 2 for item in elements)
+
+def property_tracker(sets_dict, relation_name, base_name, create=True):
+    """Devuelve el tracker de propiedades de una relación en un conjunto base (o None si no aplica)
+    
+    Construirlo cuenta los triples de la transitividad, O(Σ grado²); con create=False
+    solo se devuelve si ya existe.
+    """
+    key = (relation_name, base_name)
+    if key not in _trackers:
+        if not create:
+            return None
+        relation = sets_dict[relation_name]
+        if relation_name == base_name or not _is_pair_set(relation):
+            return None
+        _trackers[key] = RelationTracker(relation, sets_dict[base_name])
+    return _trackers[key]
+
+def bump_version(name, added=None, removed=None):
+    """Marca un conjunto como modificado para que sus resultados en caché dejen de usarse
+    
+    Si se conocen los pares agregados/eliminados, los trackers de la relación se
+    actualizan con ese delta; en otro caso se descartan y se reconstruyen al usarlos.
+    """
+    _set_versions[name] = _set_versions.get(name, 0) + 1
+    _result_cache.invalidate(name)
+    _power_cache.invalidate(name)
+    incremental = added is not None or removed is not None
+    for key in list(_trackers):
+        relation_name, base_name = key
+        if relation_name == name and incremental and _is_pair_set(added or ()):
+            _trackers[key].update(added or (), removed or ())
+        elif name in key:
+            del _trackers[key]
+
+def cached_operation(sets_dict, label, operation, names, *params):
+    """Aplica la operación a los conjuntos nombrados, reutilizando el resultado si no cambiaron"""
+    key = (label, tuple((name, _set_versions.get(name, 0)) for name in names), params)
+    return _result_cache.get_or_compute(
+        key, lambda: operation(*[sets_dict.get(name, set()) for name in names], *params)
+    )
+
+class ParseError(ValueError):
+    """Error de sintaxis en la entrada, con la posición (carácter) donde ocurrió"""
+    
+    def __init__(self, message, position):
+        super().__init__(f"{message} (posición {position})")
+        self.position = position
+
+# Tokens de la entrada: paréntesis/coma, cadena entre comillas o átomo sin comillas
+_ELEMENT_TOKEN_RE = re.compile(r"""\s*(?:([(),])|"([^"]*)"|'([^']*)'|([^,()"'\s](?:[^,()"'\n]*[^,()"'\s])?))""")
+_INT_RE = re.compile(r"[+-]?\d+")
+# Camino rápido: una tupla plana completa (sin anidar, sin comillas, en una sola línea)
+_FLAT_TUPLE_RE = re.compile(r"(\s*)\(([^()\"'\n]*)\)")
+# Camino rápido en bloque: tramo de pares simples (a,b) seguidos de coma o salto de línea
+_SIMPLE_RUN_RE = re.compile(r"""(?:\s*\(\s*[^,()"'\s]+\s*,\s*[^,()"'\s]+\s*\)(?:\s*,|[ \t\r]*\n))*""")
+_SIMPLE_PAIR_RE = re.compile(r"""\(\s*([^,()"'\s]+)\s*,\s*([^,()"'\s]+)\s*\)""")
+
+def _convert_atom(atom):
+    """Convierte un átomo sin comillas a int o float si es posible"""
+    if atom.isdecimal() or _INT_RE.fullmatch(atom):
+        return int(atom)
+    if '.' in atom:
+        try:
+            return float(atom)
+        except ValueError:
+            pass
+    return atom
+
+def _parse_elements(text, offset=0, partial=False):
+    """Analiza una lista de elementos separados por comas (o saltos de línea) en una pasada
+    
+    Devuelve (elementos, consumido). Con partial=True el texto puede cortarse a mitad de
+    un elemento: se devuelven solo los elementos completos y cuánto texto ocupan.
+    """
+    elements = []
+    current = elements
+    stack = []
+    expecting = True
+    safe_count = 0
+    safe_pos = 0
+    pos = 0
+    match_token = _ELEMENT_TOKEN_RE.match
+    match_flat = _FLAT_TUPLE_RE.match
+    
+    while True:
+        if not stack and expecting:
+            # Extraer de una vez todos los pares simples consecutivos
+            run_end = _SIMPLE_RUN_RE.match(text, pos).end()
+            if run_end > pos:
+                elements.extend([(_convert_atom(a), _convert_atom(b))
+                                 for a, b in _SIMPLE_PAIR_RE.findall(text, pos, run_end)])
+                safe_count, safe_pos = len(elements), run_end
+                pos = run_end
+        
+        if not stack:
+            flat = match_flat(text, pos)
+            if flat is not None and (expecting or '\n' in flat.group(1)):
+                if not expecting:
+                    safe_count, safe_pos = len(elements), pos
+                parts = flat.group(2).split(',')
+                elements.append(tuple([_convert_atom(part.strip()) for part in parts if part.strip()]))
+                expecting = False
+                pos = flat.end()
+                continue
+        
+        match = match_token(text, pos)
+        if match is None:
+            rest = text[pos:]
+            if not rest.strip():
+                break
+            if partial:
+                return elements[:safe_count], safe_pos
+            where = pos + len(rest) - len(rest.lstrip())
+            raise ParseError(f"carácter inesperado {text[where]!r}", offset + where)
+        
+        punct, double_quoted, single_quoted, atom = match.groups()
+        where = match.start(match.lastindex)
+        if not expecting and punct in (None, '('):
+            # Un salto de línea separa elementos de primer nivel igual que una coma
+            if not stack and '\n' in text[pos:where]:
+                safe_count, safe_pos = len(elements), pos
+                expecting = True
+            else:
+                raise ParseError("se esperaba ','", offset + where)
+        pos = match.end()
+        
+        if punct == '(':
+            stack.append((current, where))
+            current = []
+            expecting = True
+        elif punct == ')':
+            if not stack:
+                raise ParseError("')' sin '(' correspondiente", offset + where)
+            value = tuple(current)
+            current = stack.pop()[0]
+            current.append(value)
+            expecting = False
+        elif punct == ',':
+            # Las comas repetidas se ignoran, como en el formato original
+            if not stack:
+                safe_count, safe_pos = len(elements), pos
+            expecting = True
+        else:
+            if double_quoted is not None:
+                current.append(double_quoted)
+            elif single_quoted is not None:
+                current.append(single_quoted)
+            else:
+                current.append(_convert_atom(atom))
+            expecting = False
+    
+    if stack:
+        if partial:
+            return elements[:safe_count], safe_pos
+        raise ParseError("'(' sin cerrar", offset + stack[0][1])
+    if partial:
+        # El último elemento podría continuar en el siguiente bloque
+        return elements[:safe_count], safe_pos
+    return elements, len(text)
+
+def parse_elements(input_str):
+    """Parsea elementos separados por comas (admite tuplas anidadas y cadenas entre comillas)"""
+    return set(_parse_elements(input_str)[0])
+
+def parse_input(input_str):
+    """Parsea la entrada del usuario para crear elementos del conjunto"""
+    try:
+        return parse_elements(input_str)
+    except ParseError as error:
+        print(f"Error al parsear la entrada: {error}")
+        print("Use el formato: a, b, c, 1, 2, 3 o (1,a), (2,b), (3,c)")
+        return set()
+
+def iter_relation(path, chunk_size=1 << 20):
+    """Lee los elementos de un archivo por bloques, sin cargar todo el texto en memoria"""
+    offset = 0
+    buffer = ""
+    with open(path, encoding="utf-8") as source:
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            buffer += chunk
+            elements, consumed = _parse_elements(buffer, offset, partial=True)
+            if not consumed and len(buffer) > max(16 * chunk_size, 1 << 20):
+                # Ningún elemento completo en tanto texto: es un error de sintaxis real
+                _parse_elements(buffer, offset)
+            yield from elements
+            buffer = buffer[consumed:]
+            offset += consumed
+    yield from _parse_elements(buffer, offset)[0]
+
+def load_relation(path, compact=False):
+    """Carga una relación (o conjunto) desde un archivo en el formato de la opción 8"""
+    if compact:
+        return Relation(iter_relation(path))
+    return set(iter_relation(path))
+
+# Elementos que se muestran de un conjunto antes de truncar la salida
+DISPLAY_LIMIT = 200
+# Elementos por cada escritura al flujo de salida
+WRITE_CHUNK = 1000
+
+def _write_elements(elements, out, separator, limit=None):
+    """Escribe repr() de los elementos por bloques; devuelve cuántos se escribieron"""
+    written = 0
+    chunk = []
+    for element in elements:
+        if written == limit:
+            break
+        chunk.append(repr(element))
+        written += 1
+        if len(chunk) == WRITE_CHUNK:
+            out.write(separator.join(chunk))
+            chunk = [""]
+    out.write(separator.join(chunk))
+    return written
+
+def write_set(label, elements, out=None, limit=DISPLAY_LIMIT, sep=" = "):
+    """Muestra 'label = {...}' sin construir la cadena completa del conjunto
+    
+    Solo se escriben los primeros limit elementos (None: todos), seguidos del total.
+    Devuelve True si la salida se truncó.
+    """
+    if out is None:
+        out = sys.stdout
+    total = len(elements)
+    if not total:
+        out.write(f"{label}{sep}set()\n")
+        return False
+    out.write(f"{label}{sep}{{")
+    written = _write_elements(elements, out, ", ", limit)
+    truncated = written < total
+    if truncated:
+        out.write(f", ...}}  [mostrando {written} de {total} elementos]\n")
+    else:
+        out.write("}\n")
+    out.flush()
+    return truncated
+
+def export_set(elements, path):
+    """Guarda todos los elementos en un archivo, uno por línea, en el formato de la opción 8"""
+    with open(path, "w", encoding="utf-8", buffering=1 << 16) as out:
+        count = _write_elements(elements, out, ",\n")
+        out.write("\n")
+    return count
+
+def default_sets():
+    """Devuelve los conjuntos predeterminados (incluyendo los del Proyecto 2)"""
+    return {
+        'U': set(['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k', '1', '2', '3', '4', '5']),
+        'A': set(['a', '1', '3', 'd', 'g', 'h', '4', '5']),
+        'B': set(['2', '1', '4', 'e', 'f', 'g', 'k']),
+        'C': set(['b', 'd', 'f', 'h', 'k', '2', '4']),
+        'D': set(),
+        'E': {(1, 'a'), (2, 'b'), (3, 'c')},
+        # Conjuntos adicionales del Proyecto 2
+        'A2': {1, 'a', 'b'},
+        'B2': {'a', 'b', 'c'},
+        'C2': {1, 2, 3},
+        'R': {(1, 1), ('a', 'a'), ('b', 'b'), (1, 'a'), ('a', 1), ('a', 'b'), ('b', 'a'), (1, 'b'), ('b', 1)}
+    }
@@ -0,0 +1,166 @@
+"""Relaciones de equivalencia y conjuntos cociente con unión-búsqueda (disjoint set union)
+
+Las clases de la cerradura de equivalencia de R son las componentes conexas del grafo no
+dirigido de R, así que basta unir los extremos de cada par: O(|R| α(n)) en lugar de
+encadenar ref, sim y tra. R (restringida a A) es de equivalencia si y solo si cada clase
+C de esas componentes aporta exactamente |C|² pares, es decir, si R ya es C × C en cada
+clase.
+"""
+
+from core import BoolMatrix, Relation
+
+class DisjointSet:
+    """Unión-búsqueda sobre los ids 0..n-1 (unión por tamaño y compresión por mitades)"""
+
+    def __init__(self, n=0):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def add(self):
+        """Agrega un elemento nuevo en su propia clase y devuelve su id"""
+        self.parent.append(len(self.parent))
+        self.size.append(1)
+        return len(self.parent) - 1
+
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a, b):
+        """Une las clases de a y b; devuelve False si ya eran la misma"""
+        parent = self.parent
+        while parent[a] != a:
+            parent[a] = a = parent[parent[a]]
+        while parent[b] != b:
+            parent[b] = b = parent[parent[b]]
+        if a == b:
+            return False
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        return True
+
+    def groups(self):
+        """Clases como listas de ids, indexadas por su raíz"""
+        groups = {}
+        for x in range(len(self.parent)):
+            root = self.find(x)
+            if root in groups:
+                groups[root].append(x)
+            else:
+                groups[root] = [x]
+        return groups
+
+def _is_relation(relation):
+    return isinstance(relation, (set, frozenset, Relation, BoolMatrix))
+
+def _partition(relation, base_set, restrict):
+    """Une los extremos de cada par; devuelve (elementos, DisjointSet, nº de pares usados)
+
+    Con restrict solo se consideran los pares con ambos extremos en base_set; si no, los
+    elementos de R fuera de base_set también forman parte de las clases.
+    """
+    elements = []
+    ids = {}
+    dsu = DisjointSet()
+    for element in base_set:
+        if element not in ids:
+            ids[element] = dsu.add()
+            elements.append(element)
+
+    pairs = 0
+    if isinstance(relation, Relation):
+        # Sobre los ids de la relación compacta: traducir cada símbolo una sola vez
+        local = []
+        for element in relation.elements:
+            element_id = ids.get(element)
+            if element_id is None and not restrict:
+                element_id = ids[element] = dsu.add()
+                elements.append(element)
+            local.append(element_id)
+        offsets, targets = relation.offsets, relation.targets
+        union = dsu.union
+        for i, a in enumerate(local):
+            if a is None:
+                continue
+            for b in targets[offsets[i]:offsets[i + 1]]:
+                b = local[b]
+                if b is not None:
+                    if a != b:
+                        union(a, b)
+                    pairs += 1
+        return elements, dsu, pairs
+
+    union = dsu.union
+    for item in relation:
+        if not (isinstance(item, tuple) and len(item) == 2):
+            raise TypeError(f"{item!r} no es un par")
+        a, b = item
+        a_id = ids.get(a)
+        b_id = ids.get(b)
+        if a_id is None or b_id is None:
+            if restrict:
+                continue
+            if a_id is None:
+                a_id = ids[a] = dsu.add()
+                elements.append(a)
+            if b_id is None:
+                b_id = ids[b] = dsu.add()
+                elements.append(b)
+        if a_id != b_id:
+            union(a_id, b_id)
+        pairs += 1
+    return elements, dsu, pairs
+
+def is_equivalence(relation, base_set):
+    """Verifica si una relación es de equivalencia en un conjunto (ref, sim y tra a la vez)"""
+    if not _is_relation(relation):
+        return False
+    try:
+        elements, dsu, pairs = _partition(relation, base_set, restrict=True)
+    except TypeError:
+        return False
+    # Todos los pares quedan dentro de alguna clase: hay igualdad solo si cada clase está completa
+    return pairs == sum(dsu.size[root] ** 2 for root in range(len(elements)) if dsu.parent[root] == root)
+
+def _representative(members):
+    """Representante canónico de una clase: el menor elemento (o el de menor repr)"""
+    try:
+        return min(members)
+    except TypeError:
+        return min(members, key=lambda element: (type(element).__name__, repr(element)))
+
+def equivalence_classes(relation, base_set):
+    """Conjunto cociente: clases de la cerradura de equivalencia de R en base_set"""
+    if not _is_relation(relation):
+        return set()
+    elements, dsu, _ = _partition(relation, base_set, restrict=True)
+    return {frozenset(elements[x] for x in group) for group in dsu.groups().values()}
+
+def representative_map(relation, base_set):
+    """Diccionario elemento -> representante canónico de su clase"""
+    mapping = {}
+    for members in equivalence_classes(relation, base_set):
+        representative = _representative(members)
+        for element in members:
+            mapping[element] = representative
+    return mapping
+
+def equivalence_closure(relation, base_set):
+    """Menor relación de equivalencia que contiene a R y es reflexiva en base_set
+
+    Las clases incluyen también los elementos de R fuera de base_set, igual que
+    transitive_closure(symmetric_closure(reflexive_closure(R, A))).
+    """
+    if not _is_relation(relation):
+        return set()
+    elements, dsu, _ = _partition(relation, base_set, restrict=False)
+    closure = set()
+    for group in dsu.groups().values():
+        members = [elements[x] for x in group]
+        closure.update((a, b) for a in members for b in members)
+    return closure
@@ -0,0 +1,335 @@
+"""Expresiones perezosas de conjuntos con optimización algebraica
+
+Las operaciones construyen un árbol en lugar de calcular conjuntos intermedios:
+
+    expr = (leaf(A, 'A') | leaf(B, 'B')) & leaf(C, 'C')
+    evaluate(expr)
+
+Antes de evaluar, simplify() reescribe el árbol con identidades de conjuntos (asociatividad,
+idempotencia, conjunto vacío, (A \\ B) \\ C = A \\ (B ∪ C), A ∩ (B \\ C) = (A ∩ B) \\ C,
+complemento como diferencia con U) y ordena los operandos de las intersecciones del
+más pequeño al más grande. La evaluación parte del operando más pequeño y consulta los
+demás solo sobre esos candidatos, así que nunca se calcula una unión o diferencia
+intermedia más grande que el resultado.
+evaluate_batch() comparte además las subexpresiones comunes entre varias expresiones.
+"""
+
+from core import BitSet
+
+LEAF = 'leaf'
+UNION = 'union'
+INTERSECTION = 'intersection'
+DIFFERENCE = 'difference'
+COMPLEMENT = 'complement'
+PRODUCT = 'cartesian_product'
+
+_SYMBOLS = {UNION: ' ∪ ', INTERSECTION: ' ∩ ', DIFFERENCE: ' \\ ', PRODUCT: ' × '}
+
+class Expr:
+    """Nodo de una expresión de conjuntos; dos nodos son iguales si tienen la misma estructura"""
+
+    __slots__ = ('op', 'args', 'value', 'name', '_hash')
+
+    def __init__(self, op, args=(), value=None, name=None):
+        self.op = op
+        self.args = tuple(args)
+        self.value = value
+        self.name = name
+        # Las hojas se identifican por el objeto conjunto, no por su contenido
+        self._hash = hash((op, id(value)) if op == LEAF else (op, self.args))
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if not isinstance(other, Expr) or self._hash != other._hash or self.op != other.op:
+            return False
+        if self.op == LEAF:
+            return self.value is other.value
+        return self.args == other.args
+
+    def __or__(self, other):
+        return Expr(UNION, (self, other))
+
+    def __and__(self, other):
+        return Expr(INTERSECTION, (self, other))
+
+    def __sub__(self, other):
+        return Expr(DIFFERENCE, (self, other))
+
+    def __mul__(self, other):
+        return Expr(PRODUCT, (self, other))
+
+    def __repr__(self):
+        if self.op == LEAF:
+            return self.name or repr(self.value)
+        if self.op == COMPLEMENT:
+            return f"comp({self.args[1]!r})"
+        return "(" + _SYMBOLS[self.op].join(repr(arg) for arg in self.args) + ")"
+
+_EMPTY = frozenset()
+
+def leaf(value, name=None):
+    """Hoja de una expresión: un conjunto ya calculado"""
+    return Expr(LEAF, value=value, name=name)
+
+EMPTY = leaf(_EMPTY, '∅')
+
+def union(*operands):
+    return Expr(UNION, operands)
+
+def intersection(*operands):
+    return Expr(INTERSECTION, operands)
+
+def difference(set1, set2):
+    return Expr(DIFFERENCE, (set1, set2))
+
+def complement(universal, set1):
+    return Expr(COMPLEMENT, (universal, set1))
+
+def cartesian_product(set1, set2):
+    return Expr(PRODUCT, (set1, set2))
+
+def estimate(expr):
+    """Cota superior del tamaño del resultado, sin evaluar"""
+    op = expr.op
+    if op == LEAF:
+        return len(expr.value)
+    if op == UNION:
+        return sum(estimate(arg) for arg in expr.args)
+    if op == INTERSECTION:
+        return min(estimate(arg) for arg in expr.args)
+    if op in (DIFFERENCE, COMPLEMENT):
+        return estimate(expr.args[0])
+    first, second = expr.args
+    return estimate(first) * estimate(second)
+
+def _is_empty(expr):
+    return expr.op == LEAF and not len(expr.value)
+
+def _flatten(op, operands):
+    """Operandos de una operación asociativa, sin anidamientos ni repetidos"""
+    seen = {}
+    for operand in operands:
+        for item in (operand.args if operand.op == op else (operand,)):
+            seen.setdefault(item, None)
+    return list(seen)
+
+def simplify(expr):
+    """Reescribe la expresión con identidades de conjuntos (de las hojas hacia la raíz)"""
+    if expr.op == LEAF:
+        return expr
+    args = [simplify(arg) for arg in expr.args]
+    op = expr.op
+
+    if op == COMPLEMENT:
+        # Complemento respecto a U: U \ A
+        return simplify(Expr(DIFFERENCE, args))
+
+    if op == UNION:
+        operands = [arg for arg in _flatten(UNION, args) if not _is_empty(arg)]
+        if not operands:
+            return EMPTY
+        if len(operands) == 1:
+            return operands[0]
+        # El operando más grande primero: el que más probablemente contiene un elemento consultado
+        return Expr(UNION, sorted(operands, key=estimate, reverse=True))
+
+    if op == INTERSECTION:
+        operands = _flatten(INTERSECTION, args)
+        if any(_is_empty(arg) for arg in operands):
+            return EMPTY
+        # A ∩ (B \ C) = (A ∩ B) \ C: las diferencias se aplican una sola vez al final
+        removed = [arg.args[1] for arg in operands if arg.op == DIFFERENCE]
+        if removed:
+            kept = [arg.args[0] if arg.op == DIFFERENCE else arg for arg in operands]
+            return simplify(Expr(DIFFERENCE, (Expr(INTERSECTION, kept), Expr(UNION, removed))))
+        if len(operands) == 1:
+            return operands[0]
+        # El operando más pequeño primero: es el que se recorre al evaluar
+        return Expr(INTERSECTION, sorted(operands, key=estimate))
+
+    if op == DIFFERENCE:
+        first, second = args
+        if _is_empty(first) or first == second:
+            return EMPTY
+        if _is_empty(second):
+            return first
+        if first.op == INTERSECTION and second in first.args:
+            return EMPTY
+        if first.op == DIFFERENCE:
+            # (A \ B) \ C = A \ (B ∪ C)
+            return simplify(Expr(DIFFERENCE, (first.args[0], Expr(UNION, (first.args[1], second)))))
+        return Expr(DIFFERENCE, (first, second))
+
+    # Producto cartesiano
+    if any(_is_empty(arg) for arg in args):
+        return EMPTY
+    return Expr(PRODUCT, args)
+
+class _Evaluator:
+    """Evaluación sin intermedios: parte del operando más pequeño y restringe sobre él"""
+
+    def __init__(self):
+        # Subexpresiones ya calculadas (compartidas entre las expresiones de un lote)
+        self.memo = {}
+
+    def plain(self, expr):
+        """El conjunto ya disponible para una hoja o subexpresión calculada; si no, None"""
+        if expr.op == LEAF:
+            return expr.value
+        return self.memo.get(expr) if self.memo else None
+
+    def contains(self, expr, element):
+        value = self.plain(expr)
+        if value is not None:
+            return element in value
+        op = expr.op
+        if op == UNION:
+            return any(self.contains(arg, element) for arg in expr.args)
+        if op == INTERSECTION:
+            return all(self.contains(arg, element) for arg in expr.args)
+        if op in (DIFFERENCE, COMPLEMENT):
+            return self.contains(expr.args[0], element) and not self.contains(expr.args[1], element)
+        return (isinstance(element, tuple) and len(element) == 2
+                and self.contains(expr.args[0], element[0]) and self.contains(expr.args[1], element[1]))
+
+    def restrict(self, candidates, expr):
+        """candidates ∩ expr sin calcular expr: los conjuntos auxiliares son todos
+        subconjuntos de candidates (el operando más pequeño)"""
+        value = self.plain(expr)
+        if value is not None:
+            if isinstance(value, (set, frozenset)):
+                return candidates.intersection(value)
+            return {x for x in candidates if x in value}
+        op = expr.op
+        if op == UNION:
+            result = set()
+            for arg in expr.args:
+                result |= self.restrict(candidates, arg)
+            return result
+        if op == INTERSECTION:
+            for arg in expr.args:
+                candidates = self.restrict(candidates, arg)
+            return candidates
+        if op in (DIFFERENCE, COMPLEMENT):
+            inside = self.restrict(candidates, expr.args[0])
+            return inside - self.restrict(inside, expr.args[1])
+        return {x for x in candidates if self.contains(expr, x)}
+
+    def _operand(self, expr):
+        """Conjunto de un operando: el disponible o el resultado de evaluarlo"""
+        value = self.plain(expr)
+        return self.evaluate(expr) if value is None else value
+
+    def _new_set(self, expr):
+        """Resultado de un operando como set nuevo, que se puede modificar"""
+        result = self.evaluate(expr)
+        return result if isinstance(result, set) else set(result)
+
+    def evaluate(self, expr):
+        value = self.plain(expr)
+        if value is not None:
+            # Copia, para que el resultado no comparta estado con los operandos
+            return BitSet(value.universe, value.mask) if isinstance(value, BitSet) else set(value)
+        universe = _bitset_universe(expr)
+        if universe is not None:
+            return BitSet(universe, self.mask(expr))
+
+        op = expr.op
+        if op == UNION:
+            result = set()
+            for arg in expr.args:
+                result.update(self._operand(arg))
+            return result
+        if op == INTERSECTION:
+            # Se parte del operando más pequeño y los demás solo se consultan sobre él
+            result = self._new_set(expr.args[0])
+            for arg in expr.args[1:]:
+                result = self.restrict(result, arg)
+            return result
+        if op in (DIFFERENCE, COMPLEMENT):
+            first, second = expr.args
+            result = self._new_set(first)
+            # A \ (B ∪ C ∪ ...) se resta operando por operando, sin calcular la unión
+            for part in (second.args if second.op == UNION else (second,)):
+                value = self.plain(part)
+                if isinstance(value, (set, frozenset)):
+                    result.difference_update(value)
+                else:
+                    result -= self.restrict(result, part)
+            return result
+        first, second = (self._operand(arg) for arg in expr.args)
+        return {(x, y) for x in first for y in second}
+
+    def mask(self, expr):
+        """Evaluación con máscaras de bits cuando todas las hojas son BitSet del mismo universo"""
+        value = self.plain(expr)
+        if value is not None:
+            return value.mask if isinstance(value, BitSet) else 0
+        masks = [self.mask(arg) for arg in expr.args]
+        if expr.op == UNION:
+            result = 0
+            for mask in masks:
+                result |= mask
+            return result
+        if expr.op == INTERSECTION:
+            result = masks[0]
+            for mask in masks[1:]:
+                result &= mask
+            return result
+        return masks[0] & ~masks[1]
+
+def _bitset_universe(expr):
+    """Universo común si todas las hojas no vacías son BitSet y no hay productos; si no, None"""
+    universe = None
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        if node.op == PRODUCT:
+            return None
+        if node.op != LEAF:
+            stack.extend(node.args)
+        elif isinstance(node.value, BitSet):
+            if universe is None:
+                universe = node.value.universe
+            elif node.value.universe is not universe:
+                return None
+        elif len(node.value):
+            return None
+    return universe
+
+def evaluate(expr, optimize=True):
+    """Calcula el conjunto que representa la expresión"""
+    if optimize:
+        expr = simplify(expr)
+    return _Evaluator().evaluate(expr)
+
+def evaluate_batch(exprs, optimize=True):
+    """Evalúa varias expresiones calculando una sola vez las subexpresiones que comparten"""
+    if optimize:
+        exprs = [simplify(expr) for expr in exprs]
+    # Contar en cuántos lugares aparece cada subexpresión (por estructura)
+    uses = {}
+    def count(node):
+        if node.op == LEAF:
+            return
+        uses[node] = uses.get(node, 0) + 1
+        if uses[node] == 1:
+            for arg in node.args:
+                count(arg)
+    for expr in exprs:
+        count(expr)
+
+    evaluator = _Evaluator()
+    def materialize(node):
+        # De las hojas hacia la raíz: al calcular una compartida, las internas ya están en memo
+        if node.op == LEAF or node in evaluator.memo:
+            return
+        for arg in node.args:
+            materialize(arg)
+        if uses[node] > 1:
+            evaluator.memo[node] = evaluator.evaluate(node)
+    for expr in exprs:
+        materialize(expr)
+    return [evaluator.evaluate(expr) for expr in exprs]
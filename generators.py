@@ -0,0 +1,220 @@
+"""Generadores de conjuntos y relaciones grandes con semilla y propiedades garantizadas
+
+Uso:
+    python generators.py --profile equivalence --size 1000000 --density 0.001 --out r.txt
+    python generators.py --set 500000 --out a.txt
+
+Una relación se describe por su tamaño (número de pares), su densidad |R| / |A|² sobre el
+conjunto base A = {0, ..., n-1} y un perfil que fija qué propiedades cumple:
+
+    random          pares distintos al azar
+    function        cada elemento de A tiene exactamente una imagen en A
+    injective       función inyectiva de A en A (una permutación)
+    reflexive       contiene (a,a) para todo a de A
+    symmetric       (a,b) en R implica (b,a) en R
+    transitive      orden estricto: transitiva, sin lazos
+    equivalence     clases de igual tamaño (bloques C × C)
+    partial_order   reflexiva, antisimétrica y transitiva
+    chain           cadena 0 → 1 → ... → size (sin ciclos; su cerradura es un orden total)
+
+Los pares se producen fila por fila con memoria O(|A|), así que una relación puede
+escribirse al disco (en el formato de la opción 8, cargable con @ruta) sin tenerla
+completa en memoria. Las funciones y la cadena tienen densidad fija, y los órdenes
+se aproximan al tamaño pedido; los demás perfiles lo alcanzan de forma exacta (salvo que
+no quepa en A × A). La misma semilla produce siempre los mismos pares.
+"""
+
+import argparse
+import math
+import random
+import sys
+from itertools import repeat
+
+from core import export_set
+
+DEFAULT_SEED = 2024
+PROFILES = ['random', 'function', 'injective', 'reflexive', 'symmetric', 'transitive',
+            'equivalence', 'partial_order', 'chain']
+# Grado medio (pares por elemento) cuando no se indica la densidad
+DEFAULT_DEGREE = 4
+
+def generate_set(size, universe=None, seed=DEFAULT_SEED):
+    """Conjunto de size enteros distintos tomados de range(universe) (por defecto 2·size)"""
+    if universe is None:
+        universe = 2 * size
+    rng = random.Random(f"set-{size}-{universe}-{seed}")
+    return set(rng.sample(range(universe), min(size, universe)))
+
+def base_size(size, profile='random', density=None):
+    """Número de elementos del conjunto base de la relación generada"""
+    if profile not in PROFILES:
+        raise ValueError(f"perfil desconocido: {profile}")
+    if density is not None and not 0 < density <= 1:
+        raise ValueError("la densidad debe estar en (0, 1]")
+    if profile in ('function', 'injective'):
+        return max(1, size)
+    if profile == 'chain':
+        return size + 1
+    if density is None:
+        n = size // DEFAULT_DEGREE
+    else:
+        n = round(math.sqrt(size / density))
+    n = max(1, n)
+    if profile in ('reflexive', 'partial_order'):
+        # Los n pares (a,a) deben caber en el tamaño pedido
+        n = min(n, max(1, size))
+    return n
+
+def _split(total, weights, rng):
+    """Reparte total entre las filas en proporción a weights (redondeo al azar)"""
+    weight_sum = sum(weights)
+    if not weight_sum:
+        return [0] * len(weights)
+    exact = [total * w / weight_sum for w in weights]
+    counts = [int(x) for x in exact]
+    missing = total - sum(counts)
+    if missing:
+        # Las filas con mayor parte fraccionaria reciben el resto (desempate al azar)
+        order = sorted(range(len(weights)), key=lambda i: (counts[i] - exact[i], rng.random()))
+        for i in order[:missing]:
+            counts[i] += 1
+    return counts
+
+def _random_pairs(rng, n, size):
+    size = min(size, n * n)
+    for a, degree in enumerate(_split(size, [1] * n, rng)):
+        if degree:
+            yield from zip(repeat(a), rng.sample(range(n), degree))
+
+def _function_pairs(rng, n, injective):
+    if injective:
+        images = list(range(n))
+        rng.shuffle(images)
+        yield from enumerate(images)
+    else:
+        randrange = rng.randrange
+        for a in range(n):
+            yield a, randrange(n)
+
+def _reflexive_pairs(rng, n, size):
+    size = min(max(size, n), n * n)
+    for a, degree in enumerate(_split(size - n, [1] * n, rng)):
+        yield a, a
+        if degree:
+            # Destinos distintos de a: se toma de range(n - 1) y se salta a
+            for b in rng.sample(range(n - 1), degree):
+                yield a, b + (b >= a)
+
+def _symmetric_pairs(rng, n, size):
+    # Pares no ordenados {a,b} con a < b (más los lazos si sobra un par), repartidos en
+    # proporción a los que caben en cada fila; cada uno se emite en ambos sentidos
+    size = min(size, n * n)
+    off_diagonal = min(size - size % 2, n * (n - 1))
+    loops = size - off_diagonal
+    for a, degree in enumerate(_split(off_diagonal // 2, [n - 1 - a for a in range(n)], rng)):
+        if degree:
+            for b in rng.sample(range(a + 1, n), degree):
+                yield a, b
+                yield b, a
+    for a in rng.sample(range(n), loops):
+        yield a, a
+
+def _groups(rng, n, group_size):
+    """Parte una permutación al azar de range(n) en grupos de group_size elementos"""
+    elements = list(range(n))
+    rng.shuffle(elements)
+    for start in range(0, n, group_size):
+        yield elements[start:start + group_size]
+
+def _equivalence_pairs(rng, n, size):
+    # Clases de k elementos aportan n·k pares en total
+    k = min(n, max(1, round(size / n)))
+    for members in _groups(rng, n, k):
+        for a in members:
+            yield from zip(repeat(a), members)
+
+def _order_levels(k):
+    return max(1, k - k // 4)
+
+def _order_group_size(n, strict):
+    """Menor tamaño de grupo cuyo número esperado de pares a < b alcanza strict"""
+    def expected(k):
+        # n/k grupos; dos elementos quedan ordenados salvo que compartan nivel
+        return n * (k - 1) / 2 * (1 - 1 / _order_levels(k))
+    low, high = 1, n
+    while low < high:
+        middle = (low + high) // 2
+        if expected(middle) < strict:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+def _order_pairs(rng, n, size, reflexive):
+    # Cada grupo es un orden débil: niveles al azar y a < b si nivel(a) < nivel(b)
+    strict = size - n if reflexive else size
+    for members in _groups(rng, n, _order_group_size(n, strict)):
+        levels = _order_levels(len(members))
+        ranked = sorted((rng.randrange(levels), a) for a in members)
+        for i, (level, a) in enumerate(ranked):
+            if reflexive:
+                yield a, a
+            # Los de nivel mayor empiezan después del último con el mismo nivel
+            j = i + 1
+            while j < len(ranked) and ranked[j][0] == level:
+                j += 1
+            for _, b in ranked[j:]:
+                yield a, b
+
+def iter_pairs(size, profile='random', density=None, seed=DEFAULT_SEED):
+    """Pares de la relación generada, fila por fila, sobre range(base_size(...))"""
+    n = base_size(size, profile, density)
+    rng = random.Random(f"{profile}-{size}-{density}-{seed}")
+    if profile == 'random':
+        return _random_pairs(rng, n, size)
+    if profile in ('function', 'injective'):
+        return _function_pairs(rng, n, profile == 'injective')
+    if profile == 'reflexive':
+        return _reflexive_pairs(rng, n, size)
+    if profile == 'symmetric':
+        return _symmetric_pairs(rng, n, size)
+    if profile == 'equivalence':
+        return _equivalence_pairs(rng, n, size)
+    if profile == 'chain':
+        return zip(range(size), range(1, n))
+    return _order_pairs(rng, n, size, profile == 'partial_order')
+
+def generate_relation(size, profile='random', density=None, seed=DEFAULT_SEED):
+    """Genera una relación en memoria; devuelve (relación, conjunto base)"""
+    relation = set(iter_pairs(size, profile, density, seed))
+    return relation, set(range(base_size(size, profile, density)))
+
+def write_relation(path, size, profile='random', density=None, seed=DEFAULT_SEED):
+    """Escribe la relación generada en un archivo sin construirla; devuelve el número de pares"""
+    return export_set(iter_pairs(size, profile, density, seed), path)
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Genera conjuntos y relaciones grandes con semilla")
+    parser.add_argument("--profile", choices=PROFILES, default="random")
+    parser.add_argument("--size", type=int, default=100_000, help="número de pares de la relación")
+    parser.add_argument("--density", type=float, help="|R| / |A|² (por defecto, grado medio %d)" % DEFAULT_DEGREE)
+    parser.add_argument("--set", type=int, metavar="N", help="generar un conjunto de N enteros en lugar de una relación")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--out", required=True, help="archivo de salida (cargable con @ruta en la opción 8)")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.set is not None:
+            count = export_set(generate_set(args.set, seed=args.seed), args.out)
+            print(f"{count} elementos escritos en '{args.out}'")
+        else:
+            count = write_relation(args.out, args.size, args.profile, args.density, args.seed)
+            n = base_size(args.size, args.profile, args.density)
+            print(f"{count} pares sobre {n} elementos ({count / (n * n):.6f} de densidad) escritos en '{args.out}'")
+    except ValueError as error:
+        print(f"Error: {error}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
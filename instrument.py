@@ -0,0 +1,185 @@
+"""Instrumentación opcional de las operaciones de core.py
+
+Al activarla, las funciones de INSTRUMENTED se reemplazan en el módulo core (y en el
+módulo que las importó por nombre, como el menú de main.py), y las de
+INSTRUMENTED_MODULES en sus módulos (expresiones, equivalencia, órdenes y
+alcanzabilidad), por envolturas que registran, por llamada, el tiempo de pared, el
+tamaño de las entradas y de la salida, y los bloques de memoria asignados. Con
+track_memory también se mide la memoria pico con tracemalloc. Al desactivarla se
+restauran las funciones originales, así que la instrumentación apagada no tiene costo
+alguno.
+
+Los tiempos son inclusivos: si relation_power llama a relation_composition, el tiempo de
+la composición se cuenta en ambas.
+"""
+
+import functools
+import json
+import sys
+import time
+import tracemalloc
+
+# Operaciones que se envuelven (nombres de funciones de core o del menú)
+INSTRUMENTED = [
+    'union', 'intersection', 'difference', 'complement', 'cartesian_product',
+    'check_function', 'is_function', 'is_binary_relation', 'is_reflexive', 'is_symmetric',
+    'find_transitivity_violation', 'is_transitive', 'transitive_closure', 'reflexive_closure',
+    'symmetric_closure', 'equivalence_closure', 'relation_composition', 'relation_power',
+    'parse_elements', 'parse_input', 'load_relation', 'show_available_sets', 'write_set', 'export_set',
+    'property_tracker',
+]
+# Operaciones de los módulos auxiliares que usa el menú (opciones 11 y 24 a 26); el menú
+# las importa al llamarlas, así que basta con reemplazarlas en su módulo. No se cuentan
+# las consultas a un tracker o a un índice ya construidos (tiempo constante).
+INSTRUMENTED_MODULES = {
+    'expression': ['evaluate', 'evaluate_batch'],
+    'equivalence': ['is_equivalence', 'equivalence_classes', 'representative_map'],
+    'order': ['is_antisymmetric', 'is_partial_order', 'is_total_order', 'minimal_elements',
+              'maximal_elements', 'topological_sort', 'transitive_reduction'],
+    'reachability': ['strongly_connected_components', 'reachability_index', 'reaches'],
+}
+DEFAULT_STATS_FILE = 'estadisticas.json'
+
+class OperationStats:
+    """Acumulado de las llamadas a una operación"""
+
+    __slots__ = ('calls', 'seconds', 'max_seconds', 'input_size', 'output_size',
+                 'max_output_size', 'blocks', 'peak_bytes')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.input_size = 0
+        self.output_size = 0
+        self.max_output_size = 0
+        self.blocks = 0
+        self.peak_bytes = 0
+
+    def as_dict(self):
+        record = {slot: getattr(self, slot) for slot in self.__slots__}
+        record['mean_seconds'] = self.seconds / self.calls if self.calls else 0.0
+        return record
+
+_stats = {}
+_originals = {}
+_track_memory = False
+# Picos de memoria de las llamadas instrumentadas en curso (anidadas)
+_peaks = []
+
+def _size(value):
+    """Tamaño de una entrada o salida (None si no tiene longitud)"""
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+def _wrap(name, function):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        entry = _stats.get(name)
+        if entry is None:
+            entry = _stats[name] = OperationStats()
+        if _track_memory:
+            base_memory, peak = tracemalloc.get_traced_memory()
+            if _peaks:
+                # Conservar el pico de la llamada externa antes de reiniciarlo
+                _peaks[-1] = max(_peaks[-1], peak)
+            _peaks.append(0)
+            tracemalloc.reset_peak()
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        try:
+            return_value = function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            entry.blocks += sys.getallocatedblocks() - blocks
+            if _track_memory and _peaks:
+                peak = max(_peaks.pop(), tracemalloc.get_traced_memory()[1])
+                if _peaks:
+                    _peaks[-1] = max(_peaks[-1], peak)
+                entry.peak_bytes = max(entry.peak_bytes, peak - base_memory)
+            entry.calls += 1
+            entry.seconds += elapsed
+            entry.max_seconds = max(entry.max_seconds, elapsed)
+            entry.input_size += sum(_size(arg) or 0 for arg in args)
+        output_size = _size(return_value)
+        if output_size is not None:
+            entry.output_size += output_size
+            entry.max_output_size = max(entry.max_output_size, output_size)
+        return return_value
+    wrapper.__wrapped_operation__ = function
+    return wrapper
+
+def _targets(module):
+    """Pares (módulo, nombres a envolver): core, el módulo indicado (que tiene sus propias
+    referencias a las funciones de core) y los módulos auxiliares"""
+    import importlib
+    import core
+    targets = [(core, INSTRUMENTED)]
+    if module is not None and module is not core:
+        targets.append((module, INSTRUMENTED))
+    for name, functions in INSTRUMENTED_MODULES.items():
+        targets.append((importlib.import_module(name), functions))
+    return targets
+
+def is_enabled():
+    return bool(_originals)
+
+def enable(track_memory=False, module=None):
+    """Activa la instrumentación (track_memory: medir memoria pico con tracemalloc)"""
+    global _track_memory
+    if not _originals:
+        for target, names in _targets(module):
+            for name in names:
+                function = getattr(target, name, None)
+                if function is not None:
+                    _originals[target, name] = function
+                    setattr(target, name, _wrap(name, function))
+    if track_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not track_memory and _track_memory:
+        tracemalloc.stop()
+        _peaks.clear()
+    _track_memory = track_memory
+
+def disable():
+    """Restaura las funciones originales; las estadísticas se conservan"""
+    global _track_memory
+    for (target, name), function in _originals.items():
+        setattr(target, name, function)
+    _originals.clear()
+    if _track_memory:
+        tracemalloc.stop()
+    _track_memory = False
+    _peaks.clear()
+
+def reset():
+    """Borra las estadísticas acumuladas"""
+    _stats.clear()
+
+def snapshot():
+    """Estadísticas por operación, de la más lenta (tiempo total) a la más rápida"""
+    ordered = sorted(_stats.items(), key=lambda item: item[1].seconds, reverse=True)
+    return {name: entry.as_dict() for name, entry in ordered}
+
+def format_report():
+    """Tabla de texto con las estadísticas acumuladas"""
+    rows = snapshot()
+    if not rows:
+        return "No hay llamadas registradas."
+    lines = [f"{'operación':<28} {'llamadas':>8} {'total ms':>11} {'media ms':>10} {'máx ms':>10} "
+             f"{'entrada':>10} {'salida':>10} {'bloques':>9} {'pico KiB':>10}"]
+    for name, row in rows.items():
+        lines.append(
+            f"{name:<28} {row['calls']:>8} {row['seconds'] * 1000:>11.3f} {row['mean_seconds'] * 1000:>10.3f} "
+            f"{row['max_seconds'] * 1000:>10.3f} {row['input_size']:>10} {row['output_size']:>10} "
+            f"{row['blocks']:>9} {row['peak_bytes'] / 1024:>10.1f}"
+        )
+    return "\n".join(lines)
+
+def dump(path=DEFAULT_STATS_FILE):
+    """Guarda las estadísticas en un archivo JSON"""
+    with open(path, 'w', encoding='utf-8') as out:
+        json.dump({"track_memory": _track_memory, "operations": snapshot()}, out, ensure_ascii=False, indent=2)
+    return path
@@ -1,191 +1,26 @@
-def create_set(name, elements):
-    """Crea un conjunto con un nombre dado y elementos"""
-    return {name: set(elements)}
+import sys
 
-def union(set1, set2):
-    """Calcula la unión de dos conjuntos"""
-    return set1 | set2
+from core import (
+    BitSet, CartesianProduct, DISPLAY_LIMIT, FunctionReason, ParseError, Relation,
+    _is_pair_set, _parse_elements, _set_versions, bump_version, cached_operation,
+    check_function, complement, default_sets, difference, equivalence_closure, export_set,
+    find_transitivity_violation, from_bitsets, intersection, is_binary_relation, is_function,
+    is_reflexive, is_symmetric, is_transitive, load_relation, parse_input, property_tracker,
+    reflexive_closure, reflexive_transitive_closure, relation_composition, relation_power,
+    symmetric_closure, to_bitsets, transitive_closure, union, write_set
+)
 
-def intersection(set1, set2):
-    """Calcula la intersección de dos conjuntos"""
-    return set1 & set2
-
-def difference(set1, set2):
-    """Calcula la diferencia de dos conjuntos (set1 - set2)"""
-    return set1 - set2
-
-def complement(universal, set1):
-    """Calcula el complemento de set1 respecto al conjunto universal"""
-    return universal - set1
-
-def cartesian_product(set1, set2):
-    """Calcula el producto cartesiano de dos conjuntos"""
-    return {(x, y) for x in set1 for y in set2}
-
-def is_function(relation, domain_set, codomain_set):
-    """Verifica si una relación es una función"""
-    # Si la relación es un conjunto de tuplas
-    if isinstance(relation, set) and all(isinstance(item, tuple) and len(item) == 2 for item in relation):
-        domain_from_relation = {x[0] for x in relation}
-        mapping = {}
-        for x, y in relation:
-            if x in mapping and mapping[x] != y:
-                return False
-            mapping[x] = y
-        return domain_from_relation.issubset(domain_set) and all(y in codomain_set for _, y in relation)
-    else:
-        # Si no es una relación (conjunto de tuplas), no puede ser función
-        return False
-
-def is_binary_relation(relation, set1, set2):
-    """Verifica si una relación es binaria entre dos conjuntos (bin(R,A,B))"""
-    if not isinstance(relation, set):
-        return False
-    
-    # Verificar que todos los elementos sean tuplas de 2 elementos
-    if not all(isinstance(item, tuple) and len(item) == 2 for item in relation):
-        return False
-    
-    # Verificar que todos los elementos de la relación pertenezcan a A × B
-    cartesian = cartesian_product(set1, set2)
-    return relation.issubset(cartesian)
-
-def is_reflexive(relation, base_set):
-    """Verifica si una relación es reflexiva en un conjunto (ref(R,A))"""
-    if not isinstance(relation, set):
-        return False
-    
-    # Para ser reflexiva, debe contener (a,a) para todo a en el conjunto base
-    for element in base_set:
-        if (element, element) not in relation:
-            return False
-    return True
-
-def is_symmetric(relation, base_set):
-    """Verifica si una relación es simétrica (sim(R,A))"""
-    if not isinstance(relation, set):
-        return False
-    
-    # Para ser simétrica, si (a,b) está en R, entonces (b,a) debe estar en R
-    for a, b in relation:
-        # Solo verificar pares donde ambos elementos están en el conjunto base
-        if a in base_set and b in base_set:
-            if (b, a) not in relation:
-                return False
-    return True
-
-def is_transitive(relation, base_set):
-    """Verifica si una relación es transitiva (tra(R,A))"""
-    if not isinstance(relation, set):
-        return False
-    
-    # Para ser transitiva, si (a,b) y (b,c) están en R, entonces (a,c) debe estar en R
-    for a, b in relation:
-        if a in base_set and b in base_set:
-            for c, d in relation:
-                if c == b and d in base_set:  # Encontramos (b,d)
-                    if (a, d) not in relation:
-                        return False
-    return True
-
-def relation_composition(relation1, relation2):
-    """Calcula la composición de dos relaciones (R∘S)"""
-    if not isinstance(relation1, set) or not isinstance(relation2, set):
-        return set()
-    
-    composition = set()
-    
-    # Para cada par (a,b) en R1 y (c,d) en R2
-    # Si b == c, entonces (a,d) está en la composición
-    for a, b in relation1:
-        for c, d in relation2:
-            if b == c:
-                composition.add((a, d))
-    
-    return composition
-
-def relation_power(relation, power):
-    """Calcula la potencia de una relación (R^n)"""
-    if not isinstance(relation, set) or power < 1:
-        return set()
-    
-    if power == 1:
-        return relation.copy()
-    
-    result = relation.copy()
-    for i in range(power - 1):
-        result = relation_composition(result, relation)
-    
-    return result
-
-def parse_input(input_str):
-    """Parsea la entrada del usuario para crear elementos del conjunto"""
-    input_str = input_str.strip()
-    
-    # Si es una función/relación (contiene paréntesis y comas)
-    if '(' in input_str and ')' in input_str:
-        try:
-            # Remover espacios y dividir por comas fuera de paréntesis
-            elements = []
-            current = ""
-            paren_count = 0
-            
-            for char in input_str:
-                if char == '(':
-                    paren_count += 1
-                    current += char
-                elif char == ')':
-                    paren_count -= 1
-                    current += char
-                elif char == ',' and paren_count == 0:
-                    if current.strip():
-                        elements.append(current.strip())
-                    current = ""
-                else:
-                    current += char
-            
-            if current.strip():
-                elements.append(current.strip())
-            
-            # Convertir strings de tuplas a tuplas reales
-            parsed_elements = []
-            for element in elements:
-                if element.startswith('(') and element.endswith(')'):
-                    # Es una tupla
-                    tuple_content = element[1:-1]  # Remover paréntesis
-                    tuple_parts = [part.strip().strip('"\'') for part in tuple_content.split(',')]
-                    # Intentar convertir a número si es posible
-                    converted_parts = []
-                    for part in tuple_parts:
-                        try:
-                            if '.' in part:
-                                converted_parts.append(float(part))
-                            else:
-                                converted_parts.append(int(part))
-                        except ValueError:
-                            converted_parts.append(part)
-                    parsed_elements.append(tuple(converted_parts))
-                else:
-                    parsed_elements.append(element)
-            
-            return set(parsed_elements)
-        except:
-            print("Error al parsear la relación. Use el formato: (1,a), (2,b), (3,c)")
-            return set()
-    else:
-        # Elementos normales separados por comas
-        elements = [elem.strip().strip('"\'') for elem in input_str.split(',') if elem.strip()]
-        # Intentar convertir números
-        converted_elements = []
-        for elem in elements:
+def show_result(label, result):
+    """Muestra un resultado truncado y ofrece exportarlo completo si no cabe en pantalla"""
+    if write_set(label, result):
+        export = input("¿Desea exportar el resultado completo a un archivo? (s/n): ").lower()
+        if export == 's':
+            path = input("Ingrese la ruta del archivo: ").strip()
             try:
-                if '.' in elem:
-                    converted_elements.append(float(elem))
-                else:
-                    converted_elements.append(int(elem))
-            except ValueError:
-                converted_elements.append(elem)
-        return set(converted_elements)
+                count = export_set(result, path)
+                print(f"{count} elementos exportados a '{path}' (puede cargarse con @{path} en la opción 8).")
+            except OSError as error:
+                print(f"Error: No se pudo escribir el archivo: {error}")
 
 def display_menu():
     """Muestra el menú principal"""
@@ -209,14 +44,22 @@ def display_menu():
     print("16. Composición de relaciones (R∘S)")
     print("17. Potencia de relación (R^n)")
     print("18. Operaciones del Proyecto 2")
-    print("19. Salir")
-    return input("Seleccione una opción (1-19): ")
+    print("19. Cerraduras de relaciones (reflexiva, simétrica, transitiva, equivalencia)")
+    print("20. Activar/desactivar modo BitSet (conjuntos como bits sobre U)")
+    print("21. Guardar conjuntos en el catálogo persistente (disco)")
+    print("22. Estadísticas de rendimiento (instrumentación de operaciones)")
+    print("23. Exportar un conjunto completo a un archivo")
+    print("24. Relación de equivalencia y clases (conjunto cociente)")
+    print("25. Órdenes parciales (antisimetría, orden topológico, diagrama de Hasse)")
+    print("26. Alcanzabilidad en una relación (componentes fuertemente conexas)")
+    print("27. Salir")
+    return input("Seleccione una opción (1-27): ")
 
 def show_available_sets(sets_dict):
     """Muestra los conjuntos disponibles"""
     print("\nConjuntos disponibles:")
     for name, conjunto in sets_dict.items():
-        print(f"{name} = {conjunto}")
+        write_set(name, conjunto)
 
 def select_sets(sets_dict, message="Ingrese el conjunto"):
     """Permite seleccionar conjuntos de la lista disponible"""
@@ -245,12 +88,25 @@ def create_new_set(sets_dict):
     print("Ingrese los elementos del conjunto.")
     print("Para elementos normales: a, b, c, 1, 2, 3")
     print("Para relaciones/funciones: (1,a), (2,b), (3,c)")
+    print("Para cargar desde un archivo: @ruta/al/archivo.txt")
     
     elements_input = input("Elementos: ")
+    if elements_input.strip().startswith('@'):
+        path = elements_input.strip()[1:].strip()
+        try:
+            new_set = load_relation(path)
+        except (OSError, ParseError) as error:
+            print(f"Error al cargar '{path}': {error}")
+            return
+        sets_dict[name] = new_set
+        bump_version(name)
+        print(f"Conjunto '{name}' cargado desde '{path}' con {len(new_set)} elementos.")
+        return
     new_set = parse_input(elements_input)
     
     sets_dict[name] = new_set
-    print(f"Conjunto '{name}' creado exitosamente: {new_set}")
+    bump_version(name)
+    write_set(f"Conjunto '{name}' creado exitosamente", new_set, sep=": ")
 
 def edit_set(sets_dict):
     """Permite editar un conjunto existente"""
@@ -263,7 +119,7 @@ def edit_set(sets_dict):
         print(f"Error: El conjunto '{name}' no existe.")
         return
     
-    print(f"Conjunto actual '{name}': {sets_dict[name]}")
+    write_set(f"Conjunto actual '{name}'", sets_dict[name], sep=": ")
     print("\nOpciones:")
     print("1. Reemplazar completamente")
     print("2. Agregar elementos")
@@ -277,19 +133,36 @@ def edit_set(sets_dict):
         print("Para relaciones/funciones: (1,a), (2,b), (3,c)")
         elements_input = input("Elementos: ")
         sets_dict[name] = parse_input(elements_input)
-        print(f"Conjunto '{name}' actualizado: {sets_dict[name]}")
+        bump_version(name)
+        write_set(f"Conjunto '{name}' actualizado", sets_dict[name], sep=": ")
     
     elif option == '2':
         elements_input = input("Elementos a agregar: ")
         new_elements = parse_input(elements_input)
-        sets_dict[name] = sets_dict[name] | new_elements
-        print(f"Conjunto '{name}' actualizado: {sets_dict[name]}")
+        current = sets_dict[name]
+        added = new_elements - current if isinstance(current, set) else new_elements
+        if isinstance(current, set):
+            # Actualizar en el lugar: no se copia todo el conjunto por unos pocos elementos
+            current |= added
+            sets_dict[name] = current
+        else:
+            sets_dict[name] = current | new_elements
+        bump_version(name, added=added)
+        write_set(f"Conjunto '{name}' actualizado", sets_dict[name], sep=": ")
     
     elif option == '3':
         elements_input = input("Elementos a eliminar: ")
         elements_to_remove = parse_input(elements_input)
-        sets_dict[name] = sets_dict[name] - elements_to_remove
-        print(f"Conjunto '{name}' actualizado: {sets_dict[name]}")
+        current = sets_dict[name]
+        if isinstance(current, set):
+            removed = elements_to_remove & current
+            current -= removed
+            sets_dict[name] = current
+        else:
+            removed = {item for item in elements_to_remove if item in current}
+            sets_dict[name] = current - elements_to_remove
+        bump_version(name, removed=removed)
+        write_set(f"Conjunto '{name}' actualizado", sets_dict[name], sep=": ")
 
 def delete_set(sets_dict):
     """Permite eliminar un conjunto"""
@@ -309,6 +182,7 @@ def delete_set(sets_dict):
     confirm = input(f"¿Está seguro de eliminar el conjunto '{name}'? (s/n): ").lower()
     if confirm == 's':
         del sets_dict[name]
+        bump_version(name)
         print(f"Conjunto '{name}' eliminado exitosamente.")
 
 def check_function_any_set(sets_dict):
@@ -319,14 +193,13 @@ def check_function_any_set(sets_dict):
     if not selected_set:
         return
     
-    # Verificar si es una relación (conjunto de tuplas)
-    if not all(isinstance(item, tuple) and len(item) == 2 for item in selected_set):
+    # Verificar si es una relación (conjunto de tuplas) antes de pedir dominio y codominio;
+    # se detiene en el primer elemento que no es par
+    if not _is_pair_set(selected_set):
         print(f"El conjunto {set_name} no es una relación (no contiene solo tuplas de 2 elementos).")
         print("No puede ser una función.")
         return
     
-    print(f"El conjunto {set_name} es una relación: {selected_set}")
-    
     # Pedir dominio y codominio
     print("\nDefina el dominio y codominio para verificar la función:")
     
@@ -344,7 +217,7 @@ def check_function_any_set(sets_dict):
     else:
         domain_input = input("Ingrese los elementos del dominio: ")
         domain_set = parse_input(domain_input)
-        print(f"Dominio definido: {domain_set}")
+        write_set("Dominio definido", domain_set, sep=": ")
     
     # Obtener codominio
     print("\nPara el codominio, puede:")
@@ -360,59 +233,256 @@ def check_function_any_set(sets_dict):
     else:
         codomain_input = input("Ingrese los elementos del codominio: ")
         codomain_set = parse_input(codomain_input)
-        print(f"Codominio definido: {codomain_set}")
+        write_set("Codominio definido", codomain_set, sep=": ")
+    
+    # Verificar si es función (veredicto y motivo en una sola pasada)
+    check = check_function(selected_set, domain_set, codomain_set, properties=True)
+    
+    print()
+    write_set("Relación", selected_set, sep=": ")
+    write_set("Dominio", domain_set, sep=": ")
+    write_set("Codominio", codomain_set, sep=": ")
+    print(f"¿Es una función?: {check.is_function}")
+    
+    if check.is_function:
+        print(f"Total: {check.is_total}, Inyectiva: {check.is_injective}, Sobreyectiva: {check.is_surjective}")
+    elif check.reason is FunctionReason.MULTIPLE_IMAGES:
+        x, y1, y2 = check.witness
+        print(f"Razón: El elemento {x} tiene múltiples imágenes: {y1} y {y2}")
+    elif check.reason is FunctionReason.OUTSIDE_DOMAIN:
+        print(f"Razón: El elemento {check.witness[0]} del par {check.witness} no está en el dominio")
+    elif check.reason is FunctionReason.OUTSIDE_CODOMAIN:
+        print(f"Razón: La imagen {check.witness[1]} del par {check.witness} no está en el codominio")
+    else:
+        print(f"Razón: {check.reason.value}: {check.witness}")
+
+def closure_menu(sets_dict):
+    """Calcula cerraduras de una relación y permite guardarlas"""
+    print("\n--- Cerraduras de Relaciones ---")
+    relation_name, relation = select_sets(sets_dict, "Seleccione la relación")
+    if relation is None:
+        return
+    if not isinstance(relation, (set, Relation)) or not _is_pair_set(relation):
+        print(f"Error: {relation_name} no es una relación.")
+        return
     
-    # Verificar si es función
-    is_func = is_function(selected_set, domain_set, codomain_set)
+    print("\nOpciones:")
+    print("1. Cerradura reflexiva")
+    print("2. Cerradura simétrica")
+    print("3. Cerradura transitiva")
+    print("4. Cerradura reflexiva y transitiva")
+    print("5. Cerradura de equivalencia")
     
-    print(f"\nRelación: {selected_set}")
-    print(f"Dominio: {domain_set}")
-    print(f"Codominio: {codomain_set}")
-    print(f"¿Es una función?: {is_func}")
+    option = input("Seleccione una opción (1-5): ")
     
-    if not is_func:
-        # Explicar por qué no es función
-        domain_from_relation = {x[0] for x in selected_set}
-        mapping = {}
-        has_multiple_images = False
-        
-        for x, y in selected_set:
-            if x in mapping and mapping[x] != y:
-                has_multiple_images = True
-                print(f"Razón: El elemento {x} tiene múltiples imágenes: {mapping[x]} y {y}")
-                break
-            mapping[x] = y
-        
-        if not has_multiple_images:
-            if not domain_from_relation.issubset(domain_set):
-                missing = domain_from_relation - domain_set
-                print(f"Razón: Hay elementos en la relación que no están en el dominio: {missing}")
-            
-            invalid_codomain = [y for _, y in selected_set if y not in codomain_set]
-            if invalid_codomain:
-                print(f"Razón: Hay elementos en el rango que no están en el codominio: {set(invalid_codomain)}")
+    if option in ('1', '4', '5'):
+        set_name, base_set = select_sets(sets_dict, "Seleccione el conjunto base")
+        if base_set is None:
+            return
+    
+    if option == '1':
+        label = f"ref⁺({relation_name}, {set_name})"
+        result = reflexive_closure(relation, base_set)
+    elif option == '2':
+        label = f"sim⁺({relation_name})"
+        result = symmetric_closure(relation)
+    elif option == '3':
+        label = f"{relation_name}⁺"
+        result = transitive_closure(relation)
+    elif option == '4':
+        label = f"{relation_name}* en {set_name}"
+        result = reflexive_transitive_closure(relation, base_set)
+    elif option == '5':
+        label = f"eq({relation_name}, {set_name})"
+        result = equivalence_closure(relation, base_set)
+    else:
+        print("Opción no válida.")
+        return
+    
+    show_result(label, result)
+    
+    # Opción para guardar el resultado
+    save = input("¿Desea guardar el resultado como un nuevo conjunto? (s/n): ").lower()
+    if save == 's':
+        name = input("Ingrese el nombre para el nuevo conjunto: ").upper().strip()
+        sets_dict[name] = result
+        bump_version(name)
+        print(f"Conjunto '{name}' creado con {label}.")
+
+def equivalence_menu(sets_dict):
+    """Verifica si una relación es de equivalencia y muestra su conjunto cociente"""
+    from equivalence import is_equivalence, equivalence_classes, representative_map
+    
+    print("\n--- Relación de Equivalencia y Clases ---")
+    relation_name, relation = select_sets(sets_dict, "Seleccione la relación")
+    if relation is None:
+        return
+    if not isinstance(relation, (set, Relation)) or not _is_pair_set(relation):
+        print(f"Error: {relation_name} no es una relación.")
+        return
+    set_name, base_set = select_sets(sets_dict, "Seleccione el conjunto base")
+    if base_set is None:
+        return
+    
+    result = is_equivalence(relation, base_set)
+    print(f"eq({relation_name}, {set_name}) = {result}")
+    if result:
+        print(f"✓ {relation_name} es una relación de equivalencia en {set_name}")
+    else:
+        print(f"✗ {relation_name} NO es una relación de equivalencia en {set_name}")
+        print("  Las clases siguientes son las de su cerradura de equivalencia.")
+    
+    classes = equivalence_classes(relation, base_set)
+    representatives = representative_map(relation, base_set)
+    print(f"{set_name}/{relation_name} tiene {len(classes)} clases:")
+    shown = 0
+    for members in classes:
+        if shown == DISPLAY_LIMIT:
+            print(f"  ... [mostrando {shown} de {len(classes)} clases]")
+            break
+        write_set(f"  [{representatives[next(iter(members))]!r}]", members)
+        shown += 1
+    
+    # Opción para guardar el cociente
+    save = input("¿Desea guardar los representantes como un nuevo conjunto? (s/n): ").lower()
+    if save == 's':
+        name = input("Ingrese el nombre para el nuevo conjunto: ").upper().strip()
+        sets_dict[name] = set(representatives.values())
+        bump_version(name)
+        print(f"Conjunto '{name}' creado con los representantes de {set_name}/{relation_name}.")
+
+def order_menu(sets_dict):
+    """Analiza una relación como orden parcial: propiedades, extremos, orden topológico y Hasse"""
+    from order import (
+        CycleError, is_antisymmetric, is_partial_order, is_total_order, minimal_elements,
+        maximal_elements, topological_sort, transitive_reduction
+    )
+    
+    print("\n--- Órdenes Parciales ---")
+    relation_name, relation = select_sets(sets_dict, "Seleccione la relación")
+    if relation is None:
+        return
+    if not isinstance(relation, (set, Relation)) or not _is_pair_set(relation):
+        print(f"Error: {relation_name} no es una relación.")
+        return
+    set_name, base_set = select_sets(sets_dict, "Seleccione el conjunto base")
+    if base_set is None:
+        return
+    
+    print(f"anti({relation_name}, {set_name}) = {is_antisymmetric(relation, base_set)}")
+    partial = is_partial_order(relation, base_set)
+    print(f"¿Orden parcial? = {partial}")
+    if partial:
+        print(f"¿Orden total? = {is_total_order(relation, base_set)}")
+    write_set("Minimales", minimal_elements(relation, base_set))
+    write_set("Maximales", maximal_elements(relation, base_set))
+    
+    try:
+        linear = topological_sort(relation, base_set)
+    except CycleError as error:
+        print(f"Sin orden topológico ni diagrama de Hasse: {error}")
+        return
+    shown = ", ".join(repr(element) for element in linear[:DISPLAY_LIMIT])
+    if len(linear) > DISPLAY_LIMIT:
+        shown += f", ...  [mostrando {DISPLAY_LIMIT} de {len(linear)} elementos]"
+    print(f"Orden topológico: [{shown}]")
+    
+    hasse = transitive_reduction(relation, base_set)
+    show_result(f"Hasse({relation_name}, {set_name})", hasse)
+    
+    # Opción para guardar el diagrama de Hasse
+    save = input("¿Desea guardar el diagrama de Hasse como un nuevo conjunto? (s/n): ").lower()
+    if save == 's':
+        name = input("Ingrese el nombre para el nuevo conjunto: ").upper().strip()
+        sets_dict[name] = hasse
+        bump_version(name)
+        print(f"Conjunto '{name}' creado con el diagrama de Hasse de {relation_name}.")
+
+def reachability_menu(sets_dict):
+    """Construye el índice de alcanzabilidad de una relación y responde consultas"""
+    from reachability import reachability_index
+    
+    print("\n--- Alcanzabilidad (componentes fuertemente conexas) ---")
+    relation_name, relation = select_sets(sets_dict, "Seleccione la relación")
+    if relation is None:
+        return
+    if not isinstance(relation, (set, Relation)) or not _is_pair_set(relation):
+        print(f"Error: {relation_name} no es una relación.")
+        return
+    
+    index = reachability_index(relation, (relation_name, _set_versions.get(relation_name, 0)))
+    print(f"{relation_name} tiene {len(index)} componentes fuertemente conexas "
+          f"({sum(index.cyclic)} con ciclos).")
+    print("Ingrese pares 'a, b' para consultar si b es alcanzable desde a (vacío para terminar).")
+    while True:
+        text = input("Par: ").strip()
+        if not text:
+            break
+        try:
+            elements = _parse_elements(text)[0]
+        except ParseError as error:
+            print(f"Error al parsear la entrada: {error}")
+            continue
+        if len(elements) == 1 and isinstance(elements[0], tuple) and len(elements[0]) == 2:
+            elements = list(elements[0])
+        if len(elements) != 2:
+            print("Use el formato: a, b")
+            continue
+        a, b = elements
+        print(f"alc({relation_name}, {a}, {b}) = {index.reaches(a, b)}")
+
+def stats_menu():
+    """Activa la instrumentación de las operaciones y muestra o guarda sus estadísticas"""
+    import instrument
+    
+    print("\n--- Estadísticas de Rendimiento ---")
+    state = "activada" if instrument.is_enabled() else "desactivada"
+    print(f"La instrumentación está {state}.")
+    print("\nOpciones:")
+    print("1. Activar (tiempo, tamaños y bloques asignados)")
+    print("2. Activar midiendo también la memoria pico (tracemalloc, más lento)")
+    print("3. Desactivar")
+    print("4. Mostrar estadísticas")
+    print("5. Guardar estadísticas en un archivo (JSON)")
+    print("6. Reiniciar estadísticas")
+    
+    option = input("Seleccione una opción (1-6): ")
+    
+    if option in ('1', '2'):
+        instrument.enable(track_memory=(option == '2'), module=sys.modules[__name__])
+        print("Instrumentación activada.")
+    elif option == '3':
+        instrument.disable()
+        print("Instrumentación desactivada.")
+    elif option == '4':
+        print(instrument.format_report())
+    elif option == '5':
+        path = input(f"Ingrese la ruta del archivo [{instrument.DEFAULT_STATS_FILE}]: ").strip()
+        try:
+            print(f"Estadísticas guardadas en '{instrument.dump(path or instrument.DEFAULT_STATS_FILE)}'.")
+        except OSError as error:
+            print(f"Error: No se pudo guardar el archivo: {error}")
+    elif option == '6':
+        instrument.reset()
+        print("Estadísticas reiniciadas.")
+    else:
+        print("Opción no válida.")
 
 def main():
     """Función principal del programa"""
-    # Inicializar conjuntos predeterminados (incluyendo los del Proyecto 2)
-    sets_dict = {
-        'U': set(['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k', '1', '2', '3', '4', '5']),
-        'A': set(['a', '1', '3', 'd', 'g', 'h', '4', '5']),
-        'B': set(['2', '1', '4', 'e', 'f', 'g', 'k']),
-        'C': set(['b', 'd', 'f', 'h', 'k', '2', '4']),
-        'D': set(),
-        'E': {(1, 'a'), (2, 'b'), (3, 'c')},
-        # Conjuntos adicionales del Proyecto 2
-        'A2': {1, 'a', 'b'},
-        'B2': {'a', 'b', 'c'},
-        'C2': {1, 2, 3},
-        'R': {(1, 1), ('a', 'a'), ('b', 'b'), (1, 'a'), ('a', 1), ('a', 'b'), ('b', 'a'), (1, 'b'), ('b', 1)}
-    }
-
+    from store import Catalog, open_catalog, save_catalog, DEFAULT_STORE_PATH
+    
     print("¡Bienvenido al Sistema de Operaciones con Conjuntos y Relaciones!")
-    print("Conjuntos iniciales cargados:")
-    print("Proyecto 1: U, A, B, C, D, E")
-    print("Proyecto 2: A2, B2, C2, R (relación)")
+    
+    # Abrir el catálogo persistente si existe; si no, usar los conjuntos predeterminados
+    sets_dict = open_catalog()
+    if sets_dict is not None:
+        print(f"Catálogo persistente abierto desde '{DEFAULT_STORE_PATH}': {', '.join(sets_dict)}")
+    else:
+        sets_dict = default_sets()
+        print("Conjuntos iniciales cargados:")
+        print("Proyecto 1: U, A, B, C, D, E")
+        print("Proyecto 2: A2, B2, C2, R (relación)")
 
     running = True
     while running:
@@ -425,7 +495,7 @@ def main():
                 set2_name, set2 = select_sets(sets_dict, "Ingrese el segundo conjunto")
                 if set2 is not None:
                     result = union(set1, set2)
-                    print(f"{set1_name} ∪ {set2_name} = {result}")
+                    show_result(f"{set1_name} ∪ {set2_name}", result)
         
         elif choice == '2':
             print("\n--- Intersección ---")
@@ -434,7 +504,7 @@ def main():
                 set2_name, set2 = select_sets(sets_dict, "Ingrese el segundo conjunto")
                 if set2 is not None:
                     result = intersection(set1, set2)
-                    print(f"{set1_name} ∩ {set2_name} = {result}")
+                    show_result(f"{set1_name} ∩ {set2_name}", result)
         
         elif choice == '3':
             print("\n--- Diferencia ---")
@@ -443,7 +513,7 @@ def main():
                 set2_name, set2 = select_sets(sets_dict, "Ingrese el segundo conjunto")
                 if set2 is not None:
                     result = difference(set1, set2)
-                    print(f"{set1_name} \\ {set2_name} = {result}")
+                    show_result(f"{set1_name} \\ {set2_name}", result)
         
         elif choice == '4':
             print("\n--- Complemento respecto a U ---")
@@ -453,7 +523,7 @@ def main():
                     print("Error: No existe conjunto universal U.")
                 else:
                     result = complement(sets_dict['U'], selected_set)
-                    print(f"Complemento de {set_name} respecto a U = {result}")
+                    show_result(f"Complemento de {set_name} respecto a U", result)
         
         elif choice == '5':
             print("\n--- Producto Cartesiano ---")
@@ -461,8 +531,9 @@ def main():
             if set1 is not None:
                 set2_name, set2 = select_sets(sets_dict, "Ingrese el segundo conjunto")
                 if set2 is not None:
-                    result = cartesian_product(set1, set2)
-                    print(f"{set1_name} × {set2_name} = {result}")
+                    # Vista perezosa: los pares se generan a medida que se escriben
+                    result = CartesianProduct(set1, set2)
+                    show_result(f"{set1_name} × {set2_name}", result)
         
         elif choice == '6':
             check_function_any_set(sets_dict)
@@ -484,25 +555,29 @@ def main():
             print("\n=== Proyecto 1 - Operaciones Básicas con Conjuntos ===")
             A, B, C, D, E, U = sets_dict.get('A', set()), sets_dict.get('B', set()), sets_dict.get('C', set()), sets_dict.get('D', set()), sets_dict.get('E', set()), sets_dict.get('U', set())
             
-            print(f"A ∪ C = {union(A, C)}")
-            print(f"A ∩ C = {intersection(A, C)}")
-            print(f"A \\ B = {difference(A, B)}")
-            print(f"Complemento de D (D̄ respecto a U) = {complement(U, D)}")
-            temp_union = union(A, B)
-            result = intersection(temp_union, C)
-            print(f"(A ∪ B) ∩ C = {result}")
+            # Expresiones perezosas evaluadas en un solo lote (simplificadas, sin conjuntos
+            # intermedios y compartiendo subexpresiones); el lote se reutiliza mientras
+            # los conjuntos no cambien
+            from expression import leaf, complement as complement_of, evaluate_batch
+            names = ('A', 'B', 'C', 'D', 'U')
+            a, b, c, d, u = (leaf(sets_dict.get(name, set()), name) for name in names)
+            labels = ["A ∪ C", "A ∩ C", "A \\ B", "Complemento de D (D̄ respecto a U)", "(A ∪ B) ∩ C", "D \\ U"]
+            expressions = [a | c, a & c, a - b, complement_of(u, d), (a | b) & c, d - u]
+            results = cached_operation(sets_dict, 'proyecto 1', lambda *sets: evaluate_batch(expressions), names)
+            for label, result in zip(labels[:5], results):
+                write_set(label, result)
             
             # Verificar E como función
             domain_E = {1, 2, 3}
             codomain_E = {'a', 'b', 'c'}
-            print(f"Relación E = {E}")
+            write_set("Relación E", E)
             print(f"¿Es E una función? (fun(E)) = {is_function(E, domain_E, codomain_E)}")
             
-            print(f"D \\ U = {difference(D, U)}")
+            write_set(labels[5], results[5])
             
             # Producto cartesiano A × B
-            product_AB = cartesian_product(A, B)
-            print(f"A × B = {product_AB}")
+            product_AB = CartesianProduct(A, B)
+            write_set("A × B", product_AB)
             print(f"¿Es A × B una función? (fun(A × B)) = {is_function(product_AB, A, B)}")
         
         elif choice == '12':
@@ -526,19 +601,18 @@ def main():
             if relation is not None:
                 set_name, base_set = select_sets(sets_dict, "Seleccione el conjunto base")
                 if base_set is not None:
-                    result = is_reflexive(relation, base_set)
+                    # Solo se usa un tracker ya creado (opción 15): construirlo cuesta más que verificar
+                    tracker = property_tracker(sets_dict, relation_name, set_name, create=False)
+                    result = tracker.is_reflexive() if tracker else is_reflexive(relation, base_set)
                     print(f"ref({relation_name}, {set_name}) = {result}")
                     if result:
                         print(f"✓ {relation_name} es reflexiva en {set_name}")
                     else:
                         print(f"✗ {relation_name} NO es reflexiva en {set_name}")
                         # Mostrar elementos faltantes
-                        missing = []
-                        for elem in base_set:
-                            if (elem, elem) not in relation:
-                                missing.append(f"({elem},{elem})")
+                        missing = [(elem, elem) for elem in base_set if (elem, elem) not in relation]
                         if missing:
-                            print(f"  Faltan los pares: {', '.join(missing)}")
+                            write_set("  Faltan los pares", missing)
         
         elif choice == '14':
             print("\n--- Verificar Simetría (sim) ---")
@@ -546,7 +620,9 @@ def main():
             if relation is not None:
                 set_name, base_set = select_sets(sets_dict, "Seleccione el conjunto base")
                 if base_set is not None:
-                    result = is_symmetric(relation, base_set)
+                    # Solo se usa un tracker ya creado (opción 15): construirlo cuesta más que verificar
+                    tracker = property_tracker(sets_dict, relation_name, set_name, create=False)
+                    result = tracker.is_symmetric() if tracker else is_symmetric(relation, base_set)
                     print(f"sim({relation_name}, {set_name}) = {result}")
                     if result:
                         print(f"✓ {relation_name} es simétrica en {set_name}")
@@ -564,21 +640,22 @@ def main():
             if relation is not None:
                 set_name, base_set = select_sets(sets_dict, "Seleccione el conjunto base")
                 if base_set is not None:
-                    result = is_transitive(relation, base_set)
+                    # El veredicto sale del tracker; el contraejemplo solo se busca si hace falta
+                    tracker = property_tracker(sets_dict, relation_name, set_name)
+                    if tracker and tracker.is_transitive():
+                        violation = None
+                    else:
+                        violation = find_transitivity_violation(relation, base_set)
+                    result = violation is None
                     print(f"tra({relation_name}, {set_name}) = {result}")
                     if result:
                         print(f"✓ {relation_name} es transitiva en {set_name}")
                     else:
                         print(f"✗ {relation_name} NO es transitiva en {set_name}")
                         # Mostrar contraejemplo
-                        found_counterexample = False
-                        for a, b in relation:
-                            if a in base_set and b in base_set and not found_counterexample:
-                                for c, d in relation:
-                                    if c == b and d in base_set and (a, d) not in relation:
-                                        print(f"  Contraejemplo: ({a},{b}) y ({b},{d}) están en la relación pero ({a},{d}) no")
-                                        found_counterexample = True
-                                        break
+                        if violation is not None:
+                            a, b, d = violation
+                            print(f"  Contraejemplo: ({a},{b}) y ({b},{d}) están en la relación pero ({a},{d}) no")
         
         elif choice == '16':
             print("\n--- Composición de Relaciones (R∘S) ---")
@@ -587,13 +664,14 @@ def main():
                 rel2_name, relation2 = select_sets(sets_dict, "Seleccione la segunda relación")
                 if relation2 is not None:
                     result = relation_composition(relation1, relation2)
-                    print(f"{rel1_name} ∘ {rel2_name} = {result}")
+                    show_result(f"{rel1_name} ∘ {rel2_name}", result)
                     
                     # Opción para guardar el resultado
                     save = input("¿Desea guardar el resultado como un nuevo conjunto? (s/n): ").lower()
                     if save == 's':
                         name = input("Ingrese el nombre para el nuevo conjunto: ").upper().strip()
                         sets_dict[name] = result
+                        bump_version(name)
                         print(f"Conjunto '{name}' creado con la composición.")
         
         elif choice == '17':
@@ -605,14 +683,16 @@ def main():
                     if power < 1:
                         print("Error: La potencia debe ser un número entero positivo.")
                     else:
-                        result = relation_power(relation, power)
-                        print(f"{relation_name}^{power} = {result}")
+                        key = (relation_name, _set_versions.get(relation_name, 0))
+                        result = relation_power(relation, power, key)
+                        show_result(f"{relation_name}^{power}", result)
                         
                         # Opción para guardar el resultado
                         save = input("¿Desea guardar el resultado como un nuevo conjunto? (s/n): ").lower()
                         if save == 's':
                             name = input("Ingrese el nombre para el nuevo conjunto: ").upper().strip()
                             sets_dict[name] = result
+                            bump_version(name)
                             print(f"Conjunto '{name}' creado con {relation_name}^{power}.")
                 except ValueError:
                     print("Error: Ingrese un número entero válido.")
@@ -627,39 +707,83 @@ def main():
             R = sets_dict.get('R', set())
             
             print("Conjuntos del Proyecto 2:")
-            print(f"E = {E}")
-            print(f"A2 = {A2}")
-            print(f"B2 = {B2}")
-            print(f"C2 = {C2}")
-            print(f"R = {R}")
+            write_set("E", E)
+            write_set("A2", A2)
+            write_set("B2", B2)
+            write_set("C2", C2)
+            write_set("R", R)
             
             print("\nOperaciones solicitadas:")
             
             # bin(E,C2,B2)
-            bin_result = is_binary_relation(E, C2, B2)
+            bin_result = cached_operation(sets_dict, 'is_binary_relation', is_binary_relation, ('E', 'C2', 'B2'))
             print(f"bin(E, C2, B2) = {bin_result}")
             
             # ref(R,A2)
-            ref_result = is_reflexive(R, A2)
+            ref_result = cached_operation(sets_dict, 'is_reflexive', is_reflexive, ('R', 'A2'))
             print(f"ref(R, A2) = {ref_result}")
             
             # sim(R,A2) 
-            sim_result = is_symmetric(R, A2)
+            sim_result = cached_operation(sets_dict, 'is_symmetric', is_symmetric, ('R', 'A2'))
             print(f"sim(R, A2) = {sim_result}")
             
             # tra(R,A2)
-            tra_result = is_transitive(R, A2)
+            tra_result = cached_operation(sets_dict, 'is_transitive', is_transitive, ('R', 'A2'))
             print(f"tra(R, A2) = {tra_result}")
             
             # R^3
-            r_cubed = relation_power(R, 3)
-            print(f"R^3 = {r_cubed}")
+            r_cubed = cached_operation(sets_dict, 'relation_power', relation_power, ('R',), 3)
+            write_set("R^3", r_cubed)
             
             # R∘E
-            r_compose_e = relation_composition(R, E)
-            print(f"R ∘ E = {r_compose_e}")
+            r_compose_e = cached_operation(sets_dict, 'relation_composition', relation_composition, ('R', 'E'))
+            write_set("R ∘ E", r_compose_e)
         
         elif choice == '19':
+            closure_menu(sets_dict)
+        
+        elif choice == '20':
+            if any(isinstance(conjunto, BitSet) for conjunto in sets_dict.values()):
+                from_bitsets(sets_dict)
+                print("Modo BitSet desactivado: los conjuntos volvieron a su forma normal.")
+            elif 'U' not in sets_dict:
+                print("Error: No existe conjunto universal U.")
+            else:
+                to_bitsets(sets_dict)
+                converted = [name for name, conjunto in sets_dict.items() if isinstance(conjunto, BitSet)]
+                print(f"Modo BitSet activado para: {', '.join(converted)}")
+        
+        elif choice == '21':
+            if isinstance(sets_dict, Catalog):
+                print(f"Los conjuntos ya se guardan automáticamente en '{sets_dict.path}'.")
+            else:
+                sets_dict = save_catalog(sets_dict)
+                print(f"Conjuntos guardados en '{sets_dict.path}'. Los cambios posteriores se guardan automáticamente.")
+        
+        elif choice == '22':
+            stats_menu()
+        
+        elif choice == '23':
+            print("\n--- Exportar Conjunto ---")
+            set_name, selected_set = select_sets(sets_dict, "Ingrese el conjunto a exportar")
+            if selected_set is not None:
+                path = input("Ingrese la ruta del archivo: ").strip()
+                try:
+                    count = export_set(selected_set, path)
+                    print(f"{count} elementos de {set_name} exportados a '{path}'.")
+                except OSError as error:
+                    print(f"Error: No se pudo escribir el archivo: {error}")
+        
+        elif choice == '24':
+            equivalence_menu(sets_dict)
+        
+        elif choice == '25':
+            order_menu(sets_dict)
+        
+        elif choice == '26':
+            reachability_menu(sets_dict)
+        
+        elif choice == '27':
             print("Saliendo del programa...")
             running = False
         
@@ -667,4 +791,8 @@ def main():
             print("Opción no válida, intente de nuevo.")
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Modo por lotes: python main.py --batch script.txt | -e "R3 = R ** 3; print tra(R, A2)"
+        from batch import run_cli
+        sys.exit(run_cli(sys.argv[1:]))
     main()
\ No newline at end of file
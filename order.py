@@ -0,0 +1,172 @@
+"""Órdenes parciales: antisimetría, elementos minimales/maximales, orden topológico y
+diagrama de Hasse
+
+Todas las funciones trabajan sobre un índice de adyacencia de R restringida al conjunto
+base (ids densos, listas de sucesores sin lazos), construido en O(V + E). El orden
+topológico usa el algoritmo de Kahn y la reducción transitiva recorre el orden
+topológico inverso propagando los alcanzables como bitsets.
+"""
+
+from collections import deque
+
+from core import BoolMatrix, Relation, is_reflexive, is_transitive
+
+class CycleError(ValueError):
+    """La relación tiene un ciclo (fuera de los lazos), con un ciclo de ejemplo"""
+
+    def __init__(self, cycle):
+        super().__init__("la relación tiene un ciclo: " + " -> ".join(repr(element) for element in cycle))
+        self.cycle = cycle
+
+def _is_relation(relation):
+    return isinstance(relation, (set, frozenset, Relation, BoolMatrix))
+
+class _OrderIndex:
+    """Índice de adyacencia de R restringida a base_set"""
+
+    def __init__(self, relation, base_set):
+        self.nodes = list(base_set)
+        ids = {node: i for i, node in enumerate(self.nodes)}
+        self.successors = [[] for _ in self.nodes]
+        self.indegree = [0] * len(self.nodes)
+        self.edges = 0
+        for item in relation:
+            if not (isinstance(item, tuple) and len(item) == 2):
+                raise TypeError(f"{item!r} no es un par")
+            a = ids.get(item[0])
+            b = ids.get(item[1])
+            if a is None or b is None:
+                continue
+            if a != b:
+                self.successors[a].append(b)
+                self.indegree[b] += 1
+                self.edges += 1
+
+    def topological_order(self):
+        """Ids en orden topológico (Kahn); lanza CycleError si hay un ciclo"""
+        indegree = list(self.indegree)
+        successors = self.successors
+        ready = deque(i for i, degree in enumerate(indegree) if degree == 0)
+        order = []
+        while ready:
+            v = ready.popleft()
+            order.append(v)
+            for w in successors[v]:
+                indegree[w] -= 1
+                if indegree[w] == 0:
+                    ready.append(w)
+        if len(order) < len(self.nodes):
+            raise CycleError([self.nodes[v] for v in self._find_cycle(indegree)])
+        return order
+
+    def _find_cycle(self, indegree):
+        """Ciclo entre los nodos que Kahn no pudo ordenar (todos tienen un predecesor pendiente)"""
+        predecessor = {}
+        for v in range(len(self.nodes)):
+            if indegree[v] > 0:
+                for w in self.successors[v]:
+                    if indegree[w] > 0:
+                        predecessor[w] = v
+        # Retroceder por predecesores pendientes hasta repetir un nodo
+        v = next(iter(predecessor))
+        seen = {}
+        path = []
+        while v not in seen:
+            seen[v] = len(path)
+            path.append(v)
+            v = predecessor[v]
+        cycle = path[seen[v]:]
+        cycle.reverse()
+        return cycle + [cycle[0]]
+
+def is_antisymmetric(relation, base_set):
+    """Verifica si una relación es antisimétrica en un conjunto: (a,b) y (b,a) implican a = b"""
+    if not _is_relation(relation):
+        return False
+    if isinstance(relation, BoolMatrix):
+        # Ningún bit fuera de la diagonal puede estar a la vez en M y en Mᵀ
+        base = relation.mask_of(base_set)
+        transposed = relation.transpose().rows
+        return not any(row & transposed[i] & base & ~(1 << i)
+                       for i, row in enumerate(relation.rows) if base >> i & 1)
+    # Índice de sucesores en base_set (sin lazos), construido en la misma pasada que revisa
+    successors = {}
+    for item in relation:
+        if not (isinstance(item, tuple) and len(item) == 2):
+            return False
+        a, b = item
+        if a != b and a in base_set and b in base_set:
+            if a in successors.get(b, ()):
+                return False
+            if a in successors:
+                successors[a].add(b)
+            else:
+                successors[a] = {b}
+    return True
+
+def is_partial_order(relation, base_set):
+    """Verifica si una relación es un orden parcial (reflexiva, antisimétrica y transitiva)"""
+    return (is_reflexive(relation, base_set) and is_antisymmetric(relation, base_set)
+            and is_transitive(relation, base_set))
+
+def is_total_order(relation, base_set):
+    """Verifica si una relación es un orden total: orden parcial con todo par comparable"""
+    if not is_partial_order(relation, base_set):
+        return False
+    # Antisimétrica: cada par {a,b} aporta a lo sumo un par ordenado
+    index = _OrderIndex(relation, base_set)
+    n = len(index.nodes)
+    return index.edges == n * (n - 1) // 2
+
+def minimal_elements(relation, base_set):
+    """Elementos de base_set sin otro elemento por debajo (ignorando los lazos (a,a))"""
+    if not _is_relation(relation):
+        return set()
+    index = _OrderIndex(relation, base_set)
+    return {index.nodes[v] for v, degree in enumerate(index.indegree) if degree == 0}
+
+def maximal_elements(relation, base_set):
+    """Elementos de base_set sin otro elemento por encima (ignorando los lazos (a,a))"""
+    if not _is_relation(relation):
+        return set()
+    index = _OrderIndex(relation, base_set)
+    return {index.nodes[v] for v, successors in enumerate(index.successors) if not successors}
+
+def topological_sort(relation, base_set):
+    """Linealización de base_set compatible con R: si (a,b) en R, a va antes que b"""
+    if not _is_relation(relation):
+        return []
+    index = _OrderIndex(relation, base_set)
+    return [index.nodes[v] for v in index.topological_order()]
+
+def transitive_reduction(relation, base_set):
+    """Reducción transitiva de R en base_set sin lazos (diagrama de Hasse si R es orden parcial)"""
+    if not _is_relation(relation):
+        return set()
+    index = _OrderIndex(relation, base_set)
+    order = index.topological_order()
+    position = [0] * len(order)
+    for p, v in enumerate(order):
+        position[v] = p
+
+    successors = index.successors
+    nodes = index.nodes
+    # Predecesores pendientes de cada nodo: su bitset se descarta cuando ya nadie lo usa
+    pending = list(index.indegree)
+    reach = {}
+    reduction = set()
+    for v in reversed(order):
+        mask = 0
+        # Sucesores del más cercano al más lejano en el orden topológico: uno ya
+        # alcanzable desde un sucesor anterior sobra en la reducción
+        for w in sorted(successors[v], key=position.__getitem__):
+            bit = 1 << position[w]
+            if not mask & bit:
+                reduction.add((nodes[v], nodes[w]))
+                mask |= bit | reach[w]
+            pending[w] -= 1
+            if not pending[w]:
+                del reach[w]
+        if pending[v]:
+            reach[v] = mask
+    return reduction
@@ -0,0 +1,325 @@
+"""Motor paralelo opcional para las verificaciones de propiedades y la composición
+
+Se activa en el modo por lotes con --workers N (python main.py --workers 4 -e "print tra(R, A2)").
+
+Los datos de cada llamada (la relación tal como viene, sus pares en una lista o sus
+columnas CSR si ya es una Relation) se registran en _shared bajo una clave formada por
+la operación y la identidad (y el tamaño) de los operandos. El pool se crea con 'fork',
+así que los procesos heredan todo lo registrado sin copiarlo ni serializarlo, y se
+reutiliza en las llamadas siguientes mientras sus datos ya estuvieran registrados al
+crearlo: verificar varias veces la misma relación cuesta un solo arranque de procesos.
+Solo una clave nueva obliga a recrear el pool. Por eso los operandos no deben
+modificarse en el lugar entre llamadas (el modo por lotes nunca lo hace).
+
+Cada proceso revisa un tramo contiguo de pares o de filas. En cuanto una parte encuentra
+un contraejemplo se activa una bandera compartida y las demás abandonan su tramo. Los
+resultados coinciden con los de las funciones seriales de core.py, a las que se recurre
+para relaciones pequeñas, con un solo proceso o si el sistema no tiene 'fork'.
+"""
+
+import atexit
+import multiprocessing
+import os
+from array import array
+from operator import itemgetter
+
+from core import (
+    Relation, _composition_tables, _dense_elements, build_relation_index,
+    find_transitivity_violation, is_function, is_symmetric, relation_composition
+)
+
+# Por debajo de este tamaño el costo de crear los procesos supera la ganancia
+PARALLEL_MIN_PAIRS = 200_000
+# Particiones por proceso, para equilibrar la carga entre tramos de distinto costo
+PARTS_PER_WORKER = 4
+# Llamadas distintas cuyos datos se conservan para reutilizar el pool
+MAX_SHARED_CALLS = 8
+# Filas o pares entre dos consultas de la bandera de cancelación
+CANCEL_CHECK_ROWS = 1024
+
+# Datos registrados: clave -> (operandos, datos); los procesos del pool los heredan
+_shared = {}
+_pool = None
+_pool_keys = frozenset()
+_pool_workers = 0
+# Bandera compartida con los procesos: 1 mientras se descartan las partes restantes
+_cancel = None
+
+def _can_fork():
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+def _use_serial(workers, *relations):
+    return (workers < 2 or not _can_fork()
+            or sum(len(relation) for relation in relations) < PARALLEL_MIN_PAIRS)
+
+def _ranges(count, parts):
+    """Divide range(count) en a lo sumo parts tramos contiguos (inicio, fin)"""
+    step = -(-count // parts) or 1
+    return [(start, min(start + step, count)) for start in range(0, count, step)]
+
+def _register(kind, operands, build):
+    """Clave de la llamada; si sus datos no están registrados, los construye con build()"""
+    global _pool_keys
+    # Los operandos quedan referenciados en la entrada, así que su id no se reutiliza
+    key = (kind, *((id(operand), len(operand)) for operand in operands))
+    entry = _shared.pop(key, None)
+    if entry is None:
+        entry = (operands, build())
+    _shared[key] = entry
+    while len(_shared) > MAX_SHARED_CALLS:
+        # Al descartar los operandos su id puede reutilizarse: el pool deja de servir esa clave
+        evicted = next(iter(_shared))
+        del _shared[evicted]
+        _pool_keys = _pool_keys - {evicted}
+    return key
+
+def _data(key):
+    return _shared[key][1]
+
+def _get_pool(key, workers):
+    """El pool actual si ya heredó los datos de la clave; si no, uno nuevo"""
+    global _pool, _pool_keys, _pool_workers, _cancel
+    if _pool is not None and key in _pool_keys and _pool_workers == workers:
+        return _pool
+    shutdown()
+    context = multiprocessing.get_context('fork')
+    _cancel = context.RawValue('b', 0)
+    _pool = context.Pool(workers)
+    _pool_keys = frozenset(_shared)
+    _pool_workers = workers
+    return _pool
+
+def shutdown():
+    """Termina el pool de procesos (se recrea en la próxima llamada)"""
+    global _pool, _pool_keys
+    if _pool is not None:
+        _pool.terminate()
+        _pool.join()
+    _pool = None
+    _pool_keys = frozenset()
+
+atexit.register(shutdown)
+
+def _run(task, key, count, workers, stop=None):
+    """Ejecuta task(clave, inicio, fin) sobre los tramos de range(count) en el pool
+
+    Devuelve la lista de resultados en el orden de los tramos o, si stop(resultado) es
+    verdadero para alguno, ese resultado (y las partes que siguen activas se abandonan).
+    """
+    pool = _get_pool(key, workers)
+    ranges = _ranges(count, workers * PARTS_PER_WORKER)
+    if stop is None:
+        return pool.starmap(task, [(key, lo, hi) for lo, hi in ranges])
+    found = None
+    results = []
+    try:
+        for result in pool.imap_unordered(_call, [(task, key, lo, hi) for lo, hi in ranges]):
+            if found is not None:
+                continue
+            if stop(result):
+                found = result
+                _cancel.value = 1
+            else:
+                results.append(result)
+    finally:
+        _cancel.value = 0
+    return found if found is not None else results
+
+def _call(arguments):
+    task, key, lo, hi = arguments
+    return task(key, lo, hi)
+
+def _blocks(lo, hi):
+    """Subtramos de [lo, hi); se detiene si otra parte ya encontró un contraejemplo"""
+    for start in range(lo, hi, CANCEL_CHECK_ROWS):
+        if _cancel.value:
+            return
+        yield start, min(start + CANCEL_CHECK_ROWS, hi)
+
+def _is_false(result):
+    return result is False
+
+def _is_witness(result):
+    return result is not None
+
+# Tareas: leen _shared, heredado del proceso padre
+
+def _symmetric_pairs(key, lo, hi):
+    pairs, relation, base_set = _data(key)
+    for start, end in _blocks(lo, hi):
+        for a, b in pairs[start:end]:
+            if a in base_set and b in base_set and (b, a) not in relation:
+                return False
+    return True
+
+def _symmetric_rows(key, lo, hi):
+    relation, in_base = _data(key)
+    offsets, targets = relation.offsets, relation.targets
+    for start, end in _blocks(lo, hi):
+        for i in range(start, end):
+            if in_base[i]:
+                for j in targets[offsets[i]:offsets[i + 1]]:
+                    if in_base[j] and not relation.has_ids(j, i):
+                        return False
+    return True
+
+def _transitive_sources(key, lo, hi):
+    sources, successors = _data(key)
+    for start, end in _blocks(lo, hi):
+        for a in sources[start:end]:
+            a_successors = successors[a]
+            for b in a_successors:
+                b_successors = successors.get(b)
+                if b_successors and not b_successors <= a_successors:
+                    return (a, b, next(iter(b_successors - a_successors)))
+    return None
+
+def _transitive_rows(key, lo, hi):
+    relation, in_base = _data(key)
+    offsets, targets = relation.offsets, relation.targets
+    for start, end in _blocks(lo, hi):
+        for a in range(start, end):
+            if not in_base[a]:
+                continue
+            a_successors = {b for b in targets[offsets[a]:offsets[a + 1]] if in_base[b]}
+            for b in a_successors:
+                for d in targets[offsets[b]:offsets[b + 1]]:
+                    if in_base[d] and d not in a_successors:
+                        return (a, b, d)
+    return None
+
+def _function_pairs(key, lo, hi):
+    pairs, domain_set, codomain_set = _data(key)
+    for start, end in _blocks(lo, hi):
+        for item in pairs[start:end]:
+            if not (isinstance(item, tuple) and len(item) == 2):
+                return False
+            if item[0] not in domain_set or item[1] not in codomain_set:
+                return False
+    return True
+
+def _function_rows(key, lo, hi):
+    relation, domain_set, codomain_set = _data(key)
+    offsets, targets, elements = relation.offsets, relation.targets, relation.elements
+    for start, end in _blocks(lo, hi):
+        for i in range(start, end):
+            count = offsets[i + 1] - offsets[i]
+            if count > 1:
+                return False
+            if count == 1 and (elements[i] not in domain_set or elements[targets[offsets[i]]] not in codomain_set):
+                return False
+    return True
+
+def _composition_pairs(key, lo, hi):
+    pairs, index2 = _data(key)
+    composition = set()
+    for a, b in pairs[lo:hi]:
+        images = index2.get(b)
+        if images:
+            composition.update((a, d) for d in images)
+    return composition
+
+def _composition_rows(key, lo, hi):
+    first, second, _, _, to_second, from_second = _data(key)
+    offsets1, targets1 = first.offsets, first.targets
+    offsets2, targets2 = second.offsets, second.targets
+    lengths = array('Q')
+    targets = array('I')
+    for a in range(lo, hi):
+        row = set()
+        for b in targets1[offsets1[a]:offsets1[a + 1]]:
+            b2 = to_second[b]
+            if b2 >= 0:
+                row.update(targets2[offsets2[b2]:offsets2[b2 + 1]])
+        targets.extend(sorted(map(from_second.__getitem__, row)))
+        lengths.append(len(row))
+    # Columnas CSR del tramo como bytes: mucho más baratas de devolver que tuplas
+    return lengths.tobytes(), targets.tobytes()
+
+def _workers(workers):
+    return workers or os.cpu_count() or 1
+
+def _in_base(relation, base_set):
+    return bytes(map(base_set.__contains__, relation.elements))
+
+def parallel_is_symmetric(relation, base_set, workers=None):
+    """is_symmetric repartido entre procesos"""
+    workers = _workers(workers)
+    if _use_serial(workers, relation) or not isinstance(relation, (set, Relation)):
+        return is_symmetric(relation, base_set)
+    if isinstance(relation, Relation):
+        key = _register('sim', (relation, base_set), lambda: (relation, _in_base(relation, base_set)))
+        return _run(_symmetric_rows, key, len(relation.elements), workers, _is_false) is not False
+    key = _register('sim', (relation, base_set), lambda: (list(relation), relation, base_set))
+    return _run(_symmetric_pairs, key, len(relation), workers, _is_false) is not False
+
+def _transitivity_index(relation, base_set):
+    successors = build_relation_index(pair for pair in relation if pair[0] in base_set and pair[1] in base_set)
+    return list(successors), successors
+
+def parallel_find_transitivity_violation(relation, base_set, workers=None):
+    """find_transitivity_violation repartido entre procesos"""
+    workers = _workers(workers)
+    if (_use_serial(workers, relation) or not isinstance(relation, (set, Relation))
+            or (isinstance(relation, set) and _dense_elements(relation) is not None)):
+        # Las relaciones densas usan la matriz de bits del camino serial
+        return find_transitivity_violation(relation, base_set)
+    if isinstance(relation, Relation):
+        key = _register('tra', (relation, base_set), lambda: (relation, _in_base(relation, base_set)))
+        witness = _run(_transitive_rows, key, len(relation.elements), workers, _is_witness)
+        if isinstance(witness, tuple):
+            return tuple(relation.elements[i] for i in witness)
+        return None
+    key = _register('tra', (relation, base_set), lambda: _transitivity_index(relation, base_set))
+    witness = _run(_transitive_sources, key, len(_data(key)[0]), workers, _is_witness)
+    return witness if isinstance(witness, tuple) else None
+
+def parallel_is_transitive(relation, base_set, workers=None):
+    """is_transitive repartido entre procesos"""
+    if not isinstance(relation, (set, Relation)):
+        return False
+    return parallel_find_transitivity_violation(relation, base_set, workers) is None
+
+def parallel_is_function(relation, domain_set, codomain_set, workers=None):
+    """is_function repartido entre procesos"""
+    workers = _workers(workers)
+    if _use_serial(workers, relation) or not isinstance(relation, (set, Relation)):
+        return is_function(relation, domain_set, codomain_set)
+    operands = (relation, domain_set, codomain_set)
+    if isinstance(relation, Relation):
+        key = _register('fun', operands, lambda: operands)
+        return _run(_function_rows, key, len(relation.elements), workers, _is_false) is not False
+    key = _register('fun', operands, lambda: (list(relation), domain_set, codomain_set))
+    if _run(_function_pairs, key, len(relation), workers, _is_false) is False:
+        return False
+    # Todos son pares de A × B distintos: es función si ningún origen se repite
+    pairs = _data(key)[0]
+    return len(set(map(itemgetter(0), pairs))) == len(pairs)
+
+def parallel_relation_composition(relation1, relation2, workers=None):
+    """relation_composition repartido entre procesos (tramos de R1)"""
+    workers = _workers(workers)
+    if isinstance(relation1, Relation) and isinstance(relation2, Relation):
+        if _use_serial(workers, relation1, relation2):
+            return relation_composition(relation1, relation2)
+        key = _register('comp', (relation1, relation2),
+                        lambda: (relation1, relation2, *_composition_tables(relation1, relation2)))
+        _, _, elements, symbols, _, _ = _data(key)
+        offsets = array('Q', [0])
+        targets = array('I')
+        for lengths, part in _run(_composition_rows, key, len(relation1.elements), workers):
+            for length in array('Q', lengths):
+                offsets.append(offsets[-1] + length)
+            targets.frombytes(part)
+        offsets.extend([len(targets)] * (len(elements) - len(relation1.elements)))
+        return Relation._from_rows(elements, symbols, offsets, targets)
+
+    if (_use_serial(workers, relation1, relation2) or not isinstance(relation1, set)
+            or not isinstance(relation2, set) or _dense_elements(relation1, relation2) is not None):
+        return relation_composition(relation1, relation2)
+    key = _register('comp', (relation1, relation2),
+                    lambda: (list(relation1), build_relation_index(relation2)))
+    composition = set()
+    for part in _run(_composition_pairs, key, len(relation1), workers):
+        composition |= part
+    return composition
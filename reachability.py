@@ -0,0 +1,213 @@
+"""Componentes fuertemente conexas e índice de alcanzabilidad de una relación
+
+ReachabilityIndex condensa la relación en sus componentes fuertemente conexas (Tarjan
+iterativo, sin recursión) y etiqueta el DAG de la condensación con intervalos: se numera
+en postorden un bosque de expansión y cada componente guarda la lista fusionada de
+intervalos de postorden que alcanza. En cadenas y árboles basta un intervalo por
+componente (un bitset por componente crecería de forma cuadrática). Después de ese
+preprocesamiento, reaches(a, b) —¿está (a,b) en R⁺?— se responde con dos búsquedas en
+diccionario y una comparación (o una búsqueda binaria), sin calcular potencias de R.
+"""
+
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+
+from core import _plain_relation, _strongly_connected_components, build_relation_index
+
+def strongly_connected_components(relation):
+    """Componentes fuertemente conexas de R, de los sumideros hacia las fuentes"""
+    relation = _plain_relation(relation)
+    successors = build_relation_index(relation)
+    nodes = list({x for pair in relation for x in pair})
+    return [frozenset(component) for component in _strongly_connected_components(successors, nodes)]
+
+class ReachabilityIndex:
+    """Índice para consultar la cerradura transitiva R⁺ sin materializarla"""
+
+    def __init__(self, relation):
+        relation = _plain_relation(relation)
+        successors = build_relation_index(relation)
+        nodes = list({x for pair in relation for x in pair})
+        components = _strongly_connected_components(successors, nodes)
+        count = len(components)
+
+        # DAG de la condensación; Tarjan entrega los sumideros primero, así que cada
+        # arista va de una componente a otra de índice menor
+        component_of = {}
+        for c, component in enumerate(components):
+            for v in component:
+                component_of[v] = c
+        dag = [[] for _ in range(count)]
+        cyclic = [len(component) > 1 for component in components]
+        for c, component in enumerate(components):
+            children = dag[c]
+            for v in component:
+                for w in successors.get(v, ()):
+                    d = component_of[w]
+                    if d == c:
+                        cyclic[c] = True
+                    else:
+                        children.append(d)
+            if len(children) > 1 and len(component) > 1:
+                # Varios elementos pueden apuntar a la misma componente
+                dag[c] = list(set(children))
+
+        # Numeración en postorden de un bosque de expansión (DFS iterativa desde las
+        # fuentes): el subárbol de c ocupa el intervalo [low[c], post[c]]
+        has_predecessor = bytearray(count)
+        for children in dag:
+            for d in children:
+                has_predecessor[d] = 1
+        low = [0] * count
+        post = [0] * count
+        entered = bytearray(count)
+        counter = 0
+        for root in reversed(range(count)):
+            if has_predecessor[root]:
+                continue
+            entered[root] = 1
+            low[root] = counter
+            work = [(root, iter(dag[root]))]
+            while work:
+                v, children = work[-1]
+                for w in children:
+                    if not entered[w]:
+                        entered[w] = 1
+                        low[w] = counter
+                        work.append((w, iter(dag[w])))
+                        break
+                else:
+                    work.pop()
+                    post[v] = counter
+                    counter += 1
+
+        # Intervalos de cada componente: su subárbol más los intervalos de sus sucesores
+        # (ya calculados, por tener índice menor), ordenados y fusionados. Se guardan en
+        # formato CSR: los intervalos de c van de offsets[c] a offsets[c + 1]
+        offsets = array('Q', [0])
+        starts = array('I')
+        ends = array('I')
+        for c in range(count):
+            items = [(low[c], post[c])]
+            for d in dag[c]:
+                first, last = offsets[d], offsets[d + 1]
+                # Un único intervalo dentro del subárbol de c no agrega nada
+                if last - first > 1 or starts[first] < low[c] or ends[first] > post[c]:
+                    items.extend(zip(starts[first:last], ends[first:last]))
+            items.sort()
+            start, end = items[0]
+            for next_start, next_end in items[1:]:
+                if next_start > end + 1:
+                    starts.append(start)
+                    ends.append(end)
+                    start = next_start
+                if next_end > end:
+                    end = next_end
+            starts.append(start)
+            ends.append(end)
+            offsets.append(len(starts))
+
+        by_post = [0] * count
+        for c in range(count):
+            by_post[post[c]] = c
+
+        self.components = components
+        self.component_of = component_of
+        self.cyclic = cyclic
+        self.post = post
+        self.offsets = offsets
+        self.starts = starts
+        self.ends = ends
+        self._by_post = by_post
+
+    def __len__(self):
+        """Número de componentes fuertemente conexas"""
+        return len(self.components)
+
+    def _component_reaches(self, c, d):
+        if c == d:
+            return self.cyclic[c]
+        p = self.post[d]
+        k = bisect_right(self.starts, p, self.offsets[c], self.offsets[c + 1]) - 1
+        return k >= self.offsets[c] and self.ends[k] >= p
+
+    def reaches(self, a, b):
+        """Verifica si b es alcanzable desde a en uno o más pasos ((a,b) en R⁺)"""
+        c = self.component_of.get(a)
+        d = self.component_of.get(b)
+        if c is None or d is None:
+            return False
+        return self._component_reaches(c, d)
+
+    def reaches_many(self, sources, targets=None):
+        """Consultas en lote: pares (a, b), o dos columnas de orígenes y destinos
+
+        Devuelve un bytearray con 1 en cada posición cuyo par es alcanzable.
+        """
+        pairs = sources if targets is None else zip(sources, targets)
+        component_of = self.component_of.get
+        cyclic, post, offsets, starts, ends = self.cyclic, self.post, self.offsets, self.starts, self.ends
+        result = bytearray()
+        append = result.append
+        for a, b in pairs:
+            c = component_of(a)
+            d = component_of(b)
+            if c is None or d is None:
+                append(0)
+            elif c == d:
+                append(cyclic[c])
+            else:
+                p = post[d]
+                first = offsets[c]
+                last = offsets[c + 1]
+                if last - first == 1:
+                    # Caso habitual: un solo intervalo, sin búsqueda binaria
+                    append(starts[first] <= p <= ends[first])
+                else:
+                    k = bisect_right(starts, p, first, last) - 1
+                    append(k >= first and ends[k] >= p)
+        return result
+
+    def reachable_from(self, a):
+        """Elementos alcanzables desde a en uno o más pasos"""
+        c = self.component_of.get(a)
+        if c is None:
+            return set()
+        result = set()
+        for k in range(self.offsets[c], self.offsets[c + 1]):
+            for p in range(self.starts[k], self.ends[k] + 1):
+                d = self._by_post[p]
+                if d != c or self.cyclic[c]:
+                    result.update(self.components[d])
+        return result
+
+# Índices ya construidos: (nombre, versión) del conjunto -> ReachabilityIndex
+_index_cache = OrderedDict()
+_INDEX_CACHE_MAX_RELATIONS = 8
+
+def reachability_index(relation, key=None):
+    """Devuelve el índice de una relación
+    
+    Con key = (nombre, versión) del conjunto, como en relation_power, el índice se guarda
+    y se reutiliza mientras el conjunto no cambie, sin recorrer la relación.
+    """
+    if key is None:
+        return ReachabilityIndex(relation)
+    index = _index_cache.get(key)
+    if index is None:
+        index = _index_cache[key] = ReachabilityIndex(relation)
+        if len(_index_cache) > _INDEX_CACHE_MAX_RELATIONS:
+            # Descartar la relación usada hace más tiempo
+            _index_cache.popitem(last=False)
+    else:
+        _index_cache.move_to_end(key)
+    return index
+
+def reaches(relation, a, b, key=None):
+    """Verifica si b es alcanzable desde a bajo R
+    
+    Sin key se construye el índice en cada llamada: para muchas consultas, pasar key o
+    usar el índice de reachability_index.
+    """
+    return reachability_index(relation, key).reaches(a, b)
@@ -0,0 +1,362 @@
+"""Servicio HTTP/JSON (asyncio) sobre los conjuntos, con cliente de carga
+
+Uso:
+    python server.py serve --port 8000 [--workers 4] [--store conjuntos_db]
+    python server.py load --port 8000 --op tra --args R A2 --requests 20000 --concurrency 64
+
+Cada operación se expone como POST /<operación> con un cuerpo JSON:
+
+    POST /union        {"args": ["A", "C"]}
+    POST /composition  {"args": ["R", [[1, "a"], [2, "b"]]]}
+    POST /power        {"args": ["R"], "n": 3}
+    POST /tra          {"args": ["R", "A2"]}
+
+Los argumentos son nombres de conjuntos del servicio o conjuntos literales (listas; las
+listas internas se convierten en tuplas). La respuesta es {"result": ..., "size": ...}.
+GET /sets lista los conjuntos disponibles.
+
+Todo el cálculo se envía a un pool de procesos: cada proceso carga sus propios conjuntos
+(o abre el mismo catálogo, que se comparte por mmap), así que solo viajan los nombres.
+Las peticiones idénticas que llegan mientras otra igual está en curso esperan ese mismo
+resultado en lugar de recalcularlo. La única excepción son las operaciones lineales
+(unión, pertenencia, ref, sim, ...) con menos de INLINE_MAX_ELEMENTS elementos, que
+cuestan menos que el viaje al pool: se calculan en el bucle de eventos y terminan sin
+ceder el control, así que no pueden coincidir con otra igual en curso. Con --workers 0
+todo se calcula en el bucle de eventos.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import core
+from batch import to_json_value
+
+# Operaciones lineales con menos elementos que esto se calculan en el bucle de eventos
+INLINE_MAX_ELEMENTS = 1000
+MAX_BODY_BYTES = 64 << 20
+
+OPERATIONS = {
+    'union': (core.union, 2),
+    'intersection': (core.intersection, 2),
+    'difference': (core.difference, 2),
+    'cartesian_product': (core.cartesian_product, 2),
+    'composition': (core.relation_composition, 2),
+    'power': (core.relation_power, 1),
+    'is_function': (core.is_function, 3),
+    'bin': (core.is_binary_relation, 3),
+    'ref': (core.is_reflexive, 2),
+    'sim': (core.is_symmetric, 2),
+    'tra': (core.is_transitive, 2),
+}
+
+# Operaciones de costo lineal en el tamaño de los operandos (composición, potencia,
+# producto y transitividad pueden crecer mucho más y siempre van al pool)
+LINEAR_OPERATIONS = {'union', 'intersection', 'difference', 'is_function', 'bin', 'ref', 'sim'}
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+class RequestError(Exception):
+    """Petición inválida; lleva el código HTTP de la respuesta"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+    def __reduce__(self):
+        # Conservar el código al volver de un proceso del pool
+        return type(self), (self.args[0], self.status)
+
+# Conjuntos del proceso actual (el servidor o un worker del pool)
+_sets = None
+
+def _load_sets(store_path=None):
+    """Carga los conjuntos del servicio: un catálogo persistente o los predeterminados"""
+    global _sets
+    if store_path is not None:
+        from store import Catalog
+        _sets = Catalog(store_path)
+    else:
+        _sets = core.default_sets()
+    return _sets
+
+def _from_json(value):
+    """Convierte un literal JSON a elemento: las listas internas se vuelven tuplas"""
+    if isinstance(value, list):
+        return tuple(_from_json(item) for item in value)
+    return value
+
+def _resolve(argument):
+    """Un argumento es el nombre de un conjunto del servicio o un conjunto literal"""
+    if isinstance(argument, str):
+        name = argument.upper()
+        if name not in _sets:
+            raise RequestError(f"el conjunto '{name}' no existe", 404)
+        return _sets[name]
+    if isinstance(argument, list):
+        return {_from_json(item) for item in argument}
+    raise RequestError(f"argumento inválido: {argument!r}")
+
+def execute(op, args, n=None):
+    """Ejecuta una operación y devuelve el cuerpo de la respuesta (se usa también en los workers)"""
+    function, arity = OPERATIONS[op]
+    if len(args) != arity:
+        raise RequestError(f"'{op}' espera {arity} argumentos y recibió {len(args)}")
+    operands = [_resolve(argument) for argument in args]
+    if op == 'power':
+        if not isinstance(n, int) or n < 1:
+            raise RequestError("'power' requiere un entero positivo 'n'")
+        operands.append(n)
+        if isinstance(args[0], str):
+            # Los conjuntos del servicio no cambian: sus potencias se reutilizan en el proceso
+            name = args[0].upper()
+            operands.append((name, core._set_versions.get(name, 0)))
+    result = function(*operands)
+    if isinstance(result, bool):
+        return {"result": result}
+    return {"result": to_json_value(result), "size": len(result)}
+
+def _operand_size(argument):
+    if isinstance(argument, str):
+        value = _sets.get(argument.upper())
+        return len(value) if value is not None else 0
+    return len(argument) if isinstance(argument, list) else 0
+
+class SetService:
+    """Despacha las peticiones: en línea, al pool de procesos o a una petición idéntica en curso"""
+
+    def __init__(self, workers=None, store_path=None):
+        _load_sets(store_path)
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.pool = None
+        if self.workers > 0:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_load_sets,
+                                            initargs=(store_path,))
+        self.in_flight = {}
+        self.coalesced = 0
+
+    async def handle(self, op, payload):
+        if op not in OPERATIONS:
+            raise RequestError(f"operación desconocida: '{op}'", 404)
+        args = payload.get("args", [])
+        n = payload.get("n")
+        if not isinstance(args, list):
+            raise RequestError("'args' debe ser una lista")
+
+        if self.pool is None or (op in LINEAR_OPERATIONS
+                                 and sum(map(_operand_size, args)) < INLINE_MAX_ELEMENTS):
+            return execute(op, args, n)
+
+        key = (op, json.dumps(args, sort_keys=True), n)
+        pending = self.in_flight.get(key)
+        if pending is not None:
+            # Misma petición en curso: compartir su resultado
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self.in_flight[key] = future
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self.pool, execute, op, args, n)
+            future.set_result(result)
+        except Exception as error:
+            future.set_exception(error)
+            # Evitar el aviso de excepción no recuperada cuando nadie más espera
+            future.exception()
+            raise
+        finally:
+            del self.in_flight[key]
+            if not future.done():
+                # La petición líder se canceló (cliente desconectado, cierre del servidor):
+                # las que esperaban su resultado reciben CancelledError en lugar de colgarse
+                future.cancel()
+        return result
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+async def _read_request(reader):
+    """Lee una petición HTTP/1.1; devuelve (método, ruta, cabeceras, cuerpo) o None al cerrar"""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, path, _ = request_line.decode('latin-1').split(' ', 2)
+    except ValueError:
+        raise RequestError("línea de petición inválida")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get('content-length', 0) or 0)
+    if length > MAX_BODY_BYTES:
+        raise RequestError("cuerpo demasiado grande", 413)
+    body = await reader.readexactly(length) if length else b''
+    return method, path, headers, body
+
+def _response(status, payload, keep_alive):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('latin-1') + body
+
+async def _route(service, method, path, body):
+    path = path.split('?', 1)[0].rstrip('/')
+    if path == '/sets':
+        if method != 'GET':
+            raise RequestError("use GET", 405)
+        return {name: len(_sets[name]) for name in _sets}
+    if path == '/stats':
+        return {"in_flight": len(service.in_flight), "coalesced": service.coalesced, "workers": service.workers}
+    if method != 'POST':
+        raise RequestError("use POST", 405)
+    try:
+        payload = json.loads(body or b'{}')
+    except ValueError:
+        raise RequestError("cuerpo JSON inválido")
+    if not isinstance(payload, dict):
+        raise RequestError("el cuerpo debe ser un objeto JSON")
+    return await service.handle(path.lstrip('/'), payload)
+
+async def _serve_connection(service, reader, writer):
+    try:
+        while True:
+            keep_alive = True
+            try:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                status, payload = 200, await _route(service, method, path, body)
+            except RequestError as error:
+                status, payload = error.status, {"error": str(error)}
+            except (TypeError, ValueError) as error:
+                status, payload = 400, {"error": str(error)}
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            except Exception as error:
+                status, payload = 500, {"error": f"{type(error).__name__}: {error}"}
+            writer.write(_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+async def serve(host='127.0.0.1', port=8000, workers=None, store_path=None):
+    """Atiende peticiones hasta que se interrumpa el proceso"""
+    service = SetService(workers, store_path)
+    server = await asyncio.start_server(lambda r, w: _serve_connection(service, r, w), host, port)
+    print(f"Sirviendo en http://{host}:{port} ({service.workers} workers)")
+    sys.stdout.flush()
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+async def _client(host, port, request, count, latencies, errors):
+    """Una conexión persistente que envía count peticiones seguidas"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                if name.lower() == 'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if not status_line.startswith(b'HTTP/1.1 200'):
+                errors.append(status_line.decode('latin-1').strip())
+    finally:
+        writer.close()
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1)]
+
+async def load_test(host, port, op, payload, requests=10_000, concurrency=64):
+    """Mide peticiones por segundo y latencias (p50, p90, p99, máx.) contra el servicio"""
+    body = json.dumps(payload).encode('utf-8')
+    request = (f"POST /{op} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+               f"Content-Length: {len(body)}\r\n\r\n").encode('latin-1') + body
+    latencies = []
+    errors = []
+    per_client = [requests // concurrency + (i < requests % concurrency) for i in range(concurrency)]
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, request, count, latencies, errors)
+                           for count in per_client if count))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p90_ms": _percentile(latencies, 0.90) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+    }
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio HTTP/JSON de conjuntos y relaciones")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="iniciar el servicio")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    serve_parser.add_argument("--workers", type=int, help="procesos del pool (0: todo en el bucle de eventos)")
+    serve_parser.add_argument("--store", metavar="DIR", help="servir un catálogo persistente")
+
+    load_parser = commands.add_parser("load", help="prueba de carga contra un servicio en ejecución")
+    load_parser.add_argument("--host", default="127.0.0.1")
+    load_parser.add_argument("--port", type=int, default=8000)
+    load_parser.add_argument("--op", default="tra")
+    load_parser.add_argument("--args", nargs="*", default=["R", "A2"], help="nombres de conjuntos")
+    load_parser.add_argument("-n", type=int, help="exponente para 'power'")
+    load_parser.add_argument("--requests", type=int, default=10_000)
+    load_parser.add_argument("--concurrency", type=int, default=64)
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(args.host, args.port, args.workers, args.store))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    payload = {"args": args.args}
+    if args.n is not None:
+        payload["n"] = args.n
+    report = asyncio.run(load_test(args.host, args.port, args.op, payload, args.requests, args.concurrency))
+    print(f"{report['requests']} peticiones ({report['errors']} con error) en {report['seconds']:.2f} s: "
+          f"{report['requests_per_second']:.0f} peticiones/s")
+    print(f"latencia p50 {report['p50_ms']:.2f} ms, p90 {report['p90_ms']:.2f} ms, "
+          f"p99 {report['p99_ms']:.2f} ms, máx. {report['max_ms']:.2f} ms")
+    return 1 if report['errors'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
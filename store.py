@@ -0,0 +1,152 @@
+"""Catálogo persistente de conjuntos y relaciones en disco
+
+Cada conjunto se guarda en su propio archivo binario:
+
+    cabecera  '<4sBB2xIQQ4x'  firma b'PSET', versión, tipo (0 conjunto, 1 relación),
+                              nº de símbolos, nº de pares, bytes de la tabla de símbolos
+    offsets   (símbolos + 1) × uint64   desplazamientos CSR de cada fila (solo relaciones)
+    targets   pares × uint32            destinos ordenados por (origen, destino)
+    símbolos  repr() de la lista de elementos, en UTF-8
+
+Las relaciones se reabren con mmap: offsets y targets son vistas de memoria sobre el
+archivo (sin copiar), y solo la tabla de símbolos se decodifica al abrirlas.
+"""
+
+import ast
+import json
+import mmap
+import os
+import struct
+from collections.abc import MutableMapping
+
+from core import Relation
+
+MAGIC = b'PSET'
+VERSION = 1
+KIND_SET = 0
+KIND_RELATION = 1
+HEADER = struct.Struct('<4sBB2xIQQ4x')
+INDEX_FILE = 'index.json'
+DEFAULT_STORE_PATH = 'conjuntos_db'
+
+def _is_relation(elements):
+    """Un conjunto no vacío de pares se guarda como relación"""
+    if isinstance(elements, Relation):
+        return True
+    return bool(elements) and all(isinstance(item, tuple) and len(item) == 2 for item in elements)
+
+def write_entry(path, elements):
+    """Escribe un conjunto o relación en formato binario (de forma atómica)"""
+    if _is_relation(elements):
+        relation = elements if isinstance(elements, Relation) else Relation(elements)
+        kind = KIND_RELATION
+        symbols = list(relation.elements)
+        offsets = relation.offsets
+        targets = relation.targets
+        pairs = len(targets)
+    else:
+        kind = KIND_SET
+        symbols = list(elements)
+        pairs = 0
+    symbol_bytes = repr(symbols).encode('utf-8')
+
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as out:
+        out.write(HEADER.pack(MAGIC, VERSION, kind, len(symbols), pairs, len(symbol_bytes)))
+        if kind == KIND_RELATION:
+            out.write(memoryview(offsets).cast('B'))
+            out.write(memoryview(targets).cast('B'))
+        out.write(symbol_bytes)
+    os.replace(temp_path, path)
+
+def read_entry(path):
+    """Abre un conjunto (set) o una relación (Relation respaldada por mmap)"""
+    with open(path, 'rb') as source:
+        mapped = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, kind, symbol_count, pairs, symbol_size = HEADER.unpack_from(mapped, 0)
+    if magic != MAGIC or version != VERSION:
+        mapped.close()
+        raise ValueError(f"'{path}' no es un archivo de conjunto válido")
+
+    view = memoryview(mapped)
+    position = HEADER.size
+    if kind == KIND_RELATION:
+        offsets_end = position + 8 * (symbol_count + 1)
+        targets_end = offsets_end + 4 * pairs
+        offsets = view[position:offsets_end].cast('Q')
+        targets = view[offsets_end:targets_end].cast('I')
+        position = targets_end
+    symbols = ast.literal_eval(bytes(view[position:position + symbol_size]).decode('utf-8'))
+
+    if kind == KIND_SET:
+        view.release()
+        mapped.close()
+        return set(symbols)
+    relation = Relation.from_columns(symbols, offsets, targets)
+    # Mantener vivo el mapeo mientras exista la relación
+    relation._mmap = mapped
+    return relation
+
+class Catalog(MutableMapping):
+    """Diccionario de conjuntos persistente: se usa en lugar de sets_dict"""
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        index_path = os.path.join(path, INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path, encoding='utf-8') as index:
+                self._files = dict(json.load(index))
+        else:
+            self._files = {}
+        # Conjuntos ya abiertos (carga perezosa)
+        self._loaded = {}
+
+    def _save_index(self):
+        temp_path = os.path.join(self.path, INDEX_FILE + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as index:
+            json.dump(list(self._files.items()), index, ensure_ascii=False)
+        os.replace(temp_path, os.path.join(self.path, INDEX_FILE))
+
+    def __getitem__(self, name):
+        if name not in self._loaded:
+            if name not in self._files:
+                raise KeyError(name)
+            self._loaded[name] = read_entry(os.path.join(self.path, self._files[name]))
+        return self._loaded[name]
+
+    def __setitem__(self, name, elements):
+        file_name = self._files.get(name) or name.encode('utf-8').hex() + '.pset'
+        write_entry(os.path.join(self.path, file_name), elements)
+        self._loaded[name] = elements
+        if name not in self._files:
+            self._files[name] = file_name
+            self._save_index()
+
+    def __delitem__(self, name):
+        file_name = self._files.pop(name)
+        self._loaded.pop(name, None)
+        self._save_index()
+        os.remove(os.path.join(self.path, file_name))
+
+    def __iter__(self):
+        return iter(list(self._files))
+
+    def __len__(self):
+        return len(self._files)
+
+    def __contains__(self, name):
+        return name in self._files
+
+def open_catalog(path=DEFAULT_STORE_PATH):
+    """Abre un catálogo existente, o None si todavía no se ha creado"""
+    if not os.path.exists(os.path.join(path, INDEX_FILE)):
+        return None
+    return Catalog(path)
+
+def save_catalog(sets_dict, path=DEFAULT_STORE_PATH):
+    """Guarda todos los conjuntos en un catálogo persistente y lo devuelve"""
+    catalog = Catalog(path)
+    for name, elements in sets_dict.items():
+        catalog[name] = elements
+    return catalog
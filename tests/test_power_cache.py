@@ -0,0 +1,40 @@
+"""Límite de pares de PowerCache (se ejecuta con python -m pytest desde la raíz)"""
+
+import pytest
+
+import core
+from core import PowerCache, relation_power
+
+def _cycle(n):
+    return {(i, (i + 1) % n) for i in range(n)}
+
+def _stored_pairs(cache):
+    return sum(len(power) for powers in cache.entries.values() for power in powers.values())
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = PowerCache(max_pairs=300)
+    monkeypatch.setattr(core, '_power_cache', cache)
+    return cache
+
+def test_pairs_counts_powers_added_to_a_cached_entry(cache):
+    cache.max_pairs = 10_000
+    for power in (2, 7, 37):
+        relation_power(_cycle(50), power, ('R', 0))
+    assert cache.pairs == _stored_pairs(cache) > 100
+
+def test_eviction_keeps_stored_pairs_under_the_bound(cache):
+    for name in 'RST':
+        for power in (2, 3, 5):
+            relation_power(_cycle(20), power, (name, 0))
+            assert cache.pairs == _stored_pairs(cache) <= cache.max_pairs
+    # Cada una guarda R^1 a R^5, 20 pares por potencia: caben justo tres
+    assert list(cache.entries) == [('R', 0), ('S', 0), ('T', 0)]
+    relation_power(_cycle(20), 2, ('V', 0))
+    assert ('R', 0) not in cache.entries
+    assert cache.pairs == _stored_pairs(cache) <= cache.max_pairs
+
+def test_relation_larger_than_the_bound_is_not_stored(cache):
+    cache.max_pairs = 30
+    assert relation_power(_cycle(20), 2, ('R', 0)) == {(i, (i + 2) % 20) for i in range(20)}
+    assert not cache.entries and cache.pairs == 0
@@ -0,0 +1,208 @@
+"""Veredictos en lote para muchas relaciones candidatas sobre los mismos conjuntos base
+
+Uso:
+    python verdicts.py candidatos.csv --domain A2 --codomain B2 [--store conjuntos_db]
+
+Las candidatas llegan en formato columnar: tres columnas paralelas (relation_id, src, dst)
+con un par por fila, por ejemplo las de un CSV. evaluate_candidates() responde
+is_function, is_binary_relation, is_reflexive e is_symmetric para todas a la vez con la
+misma semántica que las funciones de core.py, pero sin repetir la preparación por
+candidata: BaseSets prepara una vez los conjuntos base (y los lazos (a,a) que exige la
+reflexividad), la pertenencia a ellos se calcula con map() sobre las columnas completas
+y cada candidata se resuelve con operaciones de conjuntos sobre su tramo de filas:
+
+    binaria     todas sus filas tienen src en A y dst en B
+    función     binaria, y tantos orígenes distintos como pares distintos
+    reflexiva   sus pares contienen los lazos de la base
+    simétrica   sus pares dentro de la base contienen a sus espejos (b,a)
+
+Si las filas de cada candidata no vienen contiguas, primero se ordenan por relation_id.
+"""
+
+import argparse
+import csv
+import json
+import sys
+from itertools import compress
+from operator import itemgetter, ne
+
+from core import _convert_atom
+
+CHECKS = ['is_function', 'is_binary_relation', 'is_reflexive', 'is_symmetric']
+
+_swap = itemgetter(1, 0)
+
+class BaseSets:
+    """Conjuntos base compartidos por todas las candidatas, preparados una sola vez
+
+    domain y codomain se usan en is_function e is_binary_relation (A y B); base, que
+    por defecto es domain, en is_reflexive e is_symmetric.
+    """
+
+    def __init__(self, domain, codomain=None, base=None):
+        self.domain = frozenset(domain)
+        self.codomain = self.domain if codomain is None else frozenset(codomain)
+        self.base = self.domain if base is None else frozenset(base)
+        self.loops = frozenset((a, a) for a in self.base)
+
+    def flags(self, sources, targets, which):
+        """bytes con 1 en cada fila cuyo src y dst pertenecen a los conjuntos indicados"""
+        first, second = (getattr(self, name) for name in which)
+        source_flags = bytes(map(first.__contains__, sources))
+        target_flags = bytes(map(second.__contains__, targets))
+        if not source_flags:
+            return source_flags
+        # AND fila a fila de las dos columnas de banderas 0/1, sobre enteros grandes
+        value = int.from_bytes(source_flags, 'little') & int.from_bytes(target_flags, 'little')
+        return value.to_bytes(len(source_flags), 'little')
+
+class VerdictTable:
+    """Tabla de veredictos: una fila por candidata y una columna (bytearray) por verificación"""
+
+    def __init__(self, relation_ids, columns):
+        self.relation_ids = relation_ids
+        self.columns = columns
+        self._rows = {relation_id: i for i, relation_id in enumerate(relation_ids)}
+
+    def __len__(self):
+        return len(self.relation_ids)
+
+    def __getitem__(self, relation_id):
+        """Veredictos de una candidata como diccionario verificación -> bool"""
+        i = self._rows[relation_id]
+        return {name: bool(column[i]) for name, column in self.columns.items()}
+
+    def column(self, name):
+        """Candidatas que cumplen una verificación"""
+        return [relation_id for relation_id, ok in zip(self.relation_ids, self.columns[name]) if ok]
+
+    def rows(self):
+        """Itera (relation_id, veredictos) en orden"""
+        for relation_id in self.relation_ids:
+            yield relation_id, self[relation_id]
+
+def _sorted_ids(ids):
+    try:
+        return sorted(ids)
+    except TypeError:
+        return sorted(ids, key=lambda relation_id: (type(relation_id).__name__, repr(relation_id)))
+
+def _groups(relation_ids):
+    """Tramos (relation_id, inicio, fin) de filas contiguas con el mismo relation_id"""
+    count = len(relation_ids)
+    if not count:
+        return []
+    bounds = [0, *compress(range(1, count), map(ne, relation_ids[1:], relation_ids[:-1])), count]
+    return [(relation_ids[lo], lo, hi) for lo, hi in zip(bounds, bounds[1:])]
+
+def evaluate_candidates(relation_ids, sources, targets, base_sets, candidates=None, checks=CHECKS):
+    """Evalúa todas las candidatas de las columnas (relation_id, src, dst) a la vez
+
+    base_sets es un BaseSets (o el conjunto A, que se usa como dominio, codominio y base).
+    candidates agrega ids sin filas (relaciones vacías). Devuelve un VerdictTable.
+    """
+    if not isinstance(base_sets, BaseSets):
+        base_sets = BaseSets(base_sets)
+    relation_ids = list(relation_ids)
+    sources = list(sources)
+    targets = list(targets)
+    if not len(relation_ids) == len(sources) == len(targets):
+        raise ValueError("las columnas relation_id, src y dst deben tener la misma longitud")
+    unknown = set(checks) - set(CHECKS)
+    if unknown:
+        raise ValueError(f"verificaciones desconocidas: {', '.join(sorted(unknown))}")
+
+    groups = _groups(relation_ids)
+    if len(groups) != len(set(relation_ids)):
+        # Filas de una candidata dispersas: ordenar (de forma estable) por relation_id
+        try:
+            order = sorted(range(len(relation_ids)), key=relation_ids.__getitem__)
+        except TypeError:
+            order = sorted(range(len(relation_ids)), key=lambda i: repr(relation_ids[i]))
+        relation_ids = list(map(relation_ids.__getitem__, order))
+        sources = list(map(sources.__getitem__, order))
+        targets = list(map(targets.__getitem__, order))
+        groups = _groups(relation_ids)
+
+    if candidates is not None:
+        # Candidatas sin filas: un tramo vacío
+        present = {relation_id for relation_id, _, _ in groups}
+        groups.extend((relation_id, 0, 0) for relation_id in set(candidates) - present)
+    ids = _sorted_ids({relation_id for relation_id, _, _ in groups})
+    position = {relation_id: i for i, relation_id in enumerate(ids)}
+    columns = {name: bytearray(len(ids)) for name in CHECKS if name in checks}
+
+    want_function = 'is_function' in checks
+    want_binary = want_function or 'is_binary_relation' in checks
+    want_symmetric = 'is_symmetric' in checks
+    in_product = base_sets.flags(sources, targets, ('domain', 'codomain')) if want_binary else None
+    in_base = base_sets.flags(sources, targets, ('base', 'base')) if want_symmetric else None
+    loops = base_sets.loops if 'is_reflexive' in checks else None
+
+    for relation_id, lo, hi in groups:
+        i = position[relation_id]
+        pairs = set(zip(sources[lo:hi], targets[lo:hi]))
+        if want_binary:
+            binary = in_product.count(1, lo, hi) == hi - lo
+            if 'is_binary_relation' in columns:
+                columns['is_binary_relation'][i] = binary
+            if want_function:
+                # Fuera de A × B no es función; dentro, cada origen debe tener un solo par
+                columns['is_function'][i] = binary and len(set(sources[lo:hi])) == len(pairs)
+        if loops is not None:
+            columns['is_reflexive'][i] = len(pairs) >= len(loops) and loops.issubset(pairs)
+        if want_symmetric:
+            if in_base.count(1, lo, hi) != hi - lo:
+                # Solo cuentan los pares con ambos extremos en la base
+                pairs = set(compress(zip(sources[lo:hi], targets[lo:hi]), in_base[lo:hi]))
+            columns['is_symmetric'][i] = pairs.issuperset(map(_swap, pairs))
+    return VerdictTable(ids, columns)
+
+def read_columns(path):
+    """Lee un CSV relation_id,src,dst (con o sin encabezado) como tres columnas"""
+    relation_ids, sources, targets = [], [], []
+    with open(path, newline='', encoding='utf-8') as source:
+        reader = csv.reader(source)
+        for line, row in enumerate(reader, 1):
+            if not row:
+                continue
+            if len(row) != 3:
+                raise ValueError(f"línea {line}: se esperaban 3 columnas y hay {len(row)}")
+            if line == 1 and [cell.strip() for cell in row] == ['relation_id', 'src', 'dst']:
+                continue
+            relation_id, src, dst = (_convert_atom(cell.strip()) for cell in row)
+            relation_ids.append(relation_id)
+            sources.append(src)
+            targets.append(dst)
+    return relation_ids, sources, targets
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Veredictos en lote para relaciones candidatas (CSV relation_id,src,dst)")
+    parser.add_argument("candidates", help="archivo CSV con las columnas relation_id, src y dst")
+    parser.add_argument("--domain", required=True, help="nombre del conjunto A (dominio y base)")
+    parser.add_argument("--codomain", help="nombre del conjunto B (por defecto, A)")
+    parser.add_argument("--store", metavar="DIR", help="usar un catálogo persistente en lugar de los conjuntos predeterminados")
+    args = parser.parse_args(argv)
+
+    if args.store is not None:
+        from store import Catalog
+        sets_dict = Catalog(args.store)
+    else:
+        from core import default_sets
+        sets_dict = default_sets()
+    try:
+        domain = sets_dict[args.domain.upper()]
+        codomain = sets_dict[args.codomain.upper()] if args.codomain else None
+        table = evaluate_candidates(*read_columns(args.candidates), BaseSets(domain, codomain))
+    except KeyError as error:
+        print(f"Error: El conjunto {error} no existe.")
+        return 1
+    except (OSError, ValueError) as error:
+        print(f"Error: {error}")
+        return 1
+    for relation_id, verdicts in table.rows():
+        print(json.dumps({"relation_id": relation_id, **verdicts}, ensure_ascii=False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main_cli())